@@ -0,0 +1,94 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Сессии и пользователи читаются только с основной базы: иначе
+# после входа или регистрации отстающая реплика разлогинит пользователя.
+PRIMARY_ONLY_APPS = frozenset(('sessions', 'auth'))
+
+REPLICA_GENERATION_KEY = 'core:replica:generation'
+
+_state = threading.local()
+
+
+def replica_aliases():
+    return getattr(settings, 'REPLICA_DATABASES', ())
+
+
+def replica_generation():
+    """Номер последнего обновления реплик, 0 без реплик.
+
+    Входит в ключи того, что кэшируется по данным реплики: после
+    обновления реплик старые записи кэша больше не читаются.
+    """
+    if not replica_aliases():
+        return 0
+    generation = cache.get(REPLICA_GENERATION_KEY)
+    if generation is None:
+        cache.add(REPLICA_GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(REPLICA_GENERATION_KEY)
+    return generation
+
+
+def bump_replica_generation():
+    """Отметить обновление реплик; вызывает тот, кто их обновляет."""
+    try:
+        cache.incr(REPLICA_GENERATION_KEY)
+    except ValueError:
+        cache.set(REPLICA_GENERATION_KEY, time.time_ns(), None)
+
+
+def pinned_to_primary():
+    return getattr(_state, 'pinned', False)
+
+
+@contextmanager
+def use_primary():
+    """Направить все чтения в блоке на основную базу."""
+    previous = pinned_to_primary()
+    _state.pinned = True
+    try:
+        yield
+    finally:
+        _state.pinned = previous
+
+
+def reset_write_flag():
+    _state.wrote = False
+
+
+def wrote_to_primary():
+    return getattr(_state, 'wrote', False)
+
+
+class PrimaryReplicaRouter:
+    """Запись - в основную базу, чтение - в случайную реплику.
+
+    Чтение остаётся на основной базе, если поток к ней привязан
+    (use_primary или ReplicaStickyMiddleware), если уже идёт транзакция
+    или модель из PRIMARY_ONLY_APPS.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if (not replicas or pinned_to_primary()
+                or model._meta.app_label in PRIMARY_ONLY_APPS
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики - копии основной базы, связи между ними допустимы.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replica_aliases()
@@ -0,0 +1,173 @@
+import json
+import math
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.sqlite import apply_pragmas
+
+SEED_ROWS = 20000
+PAGE_SIZE = 10
+# Таймаут sqlite3 по умолчанию, с ним работает и Django.
+DEFAULT_TIMEOUT = 5
+
+SCHEMA = (
+    'CREATE TABLE post (id INTEGER PRIMARY KEY, text TEXT NOT NULL, '
+    'pub_date TEXT NOT NULL, author_id INTEGER NOT NULL)',
+    'CREATE INDEX post_pub_date_idx ON post (pub_date, id)',
+    'CREATE INDEX post_author_pub_date_idx ON post (author_id, pub_date, id)',
+)
+
+
+def create_database(path, rows):
+    connection = sqlite3.connect(path)
+    for statement in SCHEMA:
+        connection.execute(statement)
+    connection.executemany(
+        'INSERT INTO post (text, pub_date, author_id) VALUES (?, ?, ?)',
+        ((f'Пост {i} ' * 20, f'{i:012d}', i % 100) for i in range(rows)))
+    connection.commit()
+    connection.close()
+
+
+def connect(path, pragmas):
+    connection = sqlite3.connect(path, timeout=DEFAULT_TIMEOUT)
+    apply_pragmas(connection.cursor(), pragmas)
+    return connection
+
+
+def operation(connection, write, number):
+    if write:
+        connection.execute(
+            'INSERT INTO post (text, pub_date, author_id) VALUES (?, ?, ?)',
+            ('Новый пост ' * 20, f'{time.time_ns():020d}', number % 100))
+        connection.commit()
+        return
+    if number % 2:
+        connection.execute(
+            'SELECT id, text, pub_date FROM post ORDER BY pub_date DESC, '
+            'id DESC LIMIT ?', (PAGE_SIZE,)).fetchall()
+    else:
+        connection.execute(
+            'SELECT id, text, pub_date FROM post WHERE author_id = ? '
+            'ORDER BY pub_date DESC, id DESC LIMIT ?',
+            (number % 100, PAGE_SIZE)).fetchall()
+
+
+def worker(path, pragmas, persistent, duration, write_ratio, seed):
+    """Смешанная нагрузка одного процесса в течение duration секунд.
+
+    Без persistent соединение открывается на каждую операцию, как
+    Django при CONN_MAX_AGE = 0 открывает его на каждый запрос.
+    """
+    rng = random.Random(seed)
+    latencies = []
+    writes = errors = 0
+    connection = connect(path, pragmas) if persistent else None
+    deadline = time.monotonic() + duration
+    number = 0
+    while time.monotonic() < deadline:
+        number += 1
+        write = rng.random() < write_ratio
+        started = time.perf_counter()
+        try:
+            if persistent:
+                operation(connection, write, number)
+            else:
+                current = connect(path, pragmas)
+                try:
+                    operation(current, write, number)
+                finally:
+                    current.close()
+        except sqlite3.OperationalError:
+            errors += 1
+            if persistent:
+                connection.rollback()
+            continue
+        latencies.append(time.perf_counter() - started)
+        writes += write
+    if connection is not None:
+        connection.close()
+    return latencies, writes, errors
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_profile(pragmas, persistent, workers, duration, write_ratio, rows):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'benchmark.sqlite3')
+        create_database(path, rows)
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.starmap(worker, [
+                (path, pragmas, persistent, duration, write_ratio, seed)
+                for seed in range(workers)
+            ])
+    latencies = [value for result in results for value in result[0]]
+    writes = sum(result[1] for result in results)
+    return {
+        'ops_per_second': round(len(latencies) / duration, 1),
+        'writes_per_second': round(writes / duration, 1),
+        'median_ms': round(statistics.median(latencies) * 1000, 3)
+        if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3)
+        if latencies else None,
+        'errors': sum(result[2] for result in results),
+    }
+
+
+class Command(BaseCommand):
+    help = ('Сравнить пропускную способность SQLite при параллельной '
+            'смешанной нагрузке: настройки по умолчанию, SQLITE_PRAGMAS '
+            'с новым соединением на операцию и SQLITE_PRAGMAS с '
+            'постоянными соединениями. Работает на временной базе.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int,
+                            default=os.cpu_count() or 2)
+        parser.add_argument('--duration', type=float, default=5,
+                            help='Секунд нагрузки на профиль.')
+        parser.add_argument('--write-ratio', type=float, default=0.2,
+                            help='Доля операций записи.')
+        parser.add_argument('--rows', type=int, default=SEED_ROWS,
+                            help='Строк в базе перед замером.')
+        parser.add_argument('--output', help='Сохранить отчёт в JSON.')
+
+    def handle(self, *args, **options):
+        profiles = {
+            'default': ({}, False),
+            'pragmas': (settings.SQLITE_PRAGMAS, False),
+            'tuned': (settings.SQLITE_PRAGMAS, True),
+        }
+        report = {
+            'workers': options['workers'],
+            'write_ratio': options['write_ratio'],
+            'results': {
+                name: run_profile(
+                    pragmas, persistent, options['workers'],
+                    options['duration'], options['write_ratio'],
+                    options['rows'])
+                for name, (pragmas, persistent) in profiles.items()
+            },
+        }
+        self.stdout.write(
+            f'{"profile":<10}{"ops/s":>10}{"writes/s":>10}'
+            f'{"median ms":>11}{"p99 ms":>10}{"errors":>8}')
+        for name, result in report['results'].items():
+            self.stdout.write(
+                f'{name:<10}{result["ops_per_second"]:>10}'
+                f'{result["writes_per_second"]:>10}'
+                f'{str(result["median_ms"]):>11}'
+                f'{str(result["p99_ms"]):>10}{result["errors"]:>8}')
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
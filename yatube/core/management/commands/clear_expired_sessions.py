@@ -0,0 +1,42 @@
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def delete_expired_sessions(batch_size=BATCH_SIZE, pause=0):
+    """Удалить истёкшие сессии пачками, вернуть их число.
+
+    Каждая пачка - отдельная короткая транзакция по индексу
+    expire_date, поэтому запись в SQLite не блокируется надолго, как
+    при одном DELETE всей таблицы в clearsessions.
+    """
+    now = timezone.now()
+    deleted = 0
+    while True:
+        keys = list(
+            Session.objects.filter(expire_date__lt=now)
+            .values_list('session_key', flat=True)[:batch_size])
+        if not keys:
+            return deleted
+        deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+        if pause:
+            time.sleep(pause)
+
+
+class Command(BaseCommand):
+    help = ('Удалить истёкшие сессии из django_session пачками. '
+            'Запускайте по расписанию, например раз в сутки из cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Пауза между пачками, секунд.')
+
+    def handle(self, *args, **options):
+        deleted = delete_expired_sessions(options['batch_size'],
+                                          options['pause'])
+        self.stdout.write(f'Удалено истёкших сессий: {deleted}')
@@ -0,0 +1,61 @@
+import json
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.slow_queries import normalize_sql
+
+SORT_KEYS = ('total', 'count', 'max')
+
+
+def summarize(records):
+    """Сгруппировать записи по view, месту вызова и виду запроса."""
+    groups = defaultdict(lambda: {'count': 0, 'total': 0.0, 'max': 0.0})
+    for record in records:
+        template = record.get('template')
+        call_site = (
+            f'{template["name"]}:{template["line"]} ({template["node"]})'
+            if template else
+            (record['stack'][-1] if record.get('stack') else '?'))
+        key = (record.get('view') or '?', call_site,
+               normalize_sql(record['sql']))
+        group = groups[key]
+        group['count'] += 1
+        group['total'] += record['duration_ms']
+        group['max'] = max(group['max'], record['duration_ms'])
+        group['stack'] = record.get('stack', [])
+    return [dict(group, view=view, call_site=call_site, sql=sql)
+            for (view, call_site, sql), group in groups.items()]
+
+
+class Command(BaseCommand):
+    help = 'Сводка журнала медленных запросов: самые дорогие места вызова.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл SLOW_QUERY_LOG.')
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument('--sort', choices=SORT_KEYS, default='total',
+                            help='Суммарное время, число или максимум.')
+        parser.add_argument('--view', help='Только запросы этой view.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], encoding='utf-8') as log:
+                records = [json.loads(line) for line in log if line.strip()]
+        except OSError as error:
+            raise CommandError(f'Не удалось прочитать журнал: {error}')
+        if options['view']:
+            records = [record for record in records
+                       if record.get('view') == options['view']]
+        groups = sorted(summarize(records),
+                        key=lambda group: group[options['sort']],
+                        reverse=True)[:options['limit']]
+        self.stdout.write(f'Медленных запросов: {len(records)}')
+        for number, group in enumerate(groups, start=1):
+            self.stdout.write(
+                f'\n{number}. {group["view"]} {group["call_site"]}: '
+                f'{group["count"]} раз, всего {group["total"]:.1f} мс, '
+                f'максимум {group["max"]:.1f} мс')
+            self.stdout.write(f'   {group["sql"][:300]}')
+            for frame in group['stack']:
+                self.stdout.write(f'     {frame}')
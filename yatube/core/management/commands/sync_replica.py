@@ -0,0 +1,55 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from core.db_router import bump_replica_generation
+
+
+def copy_database(source_path, target_path):
+    """Снимок SQLite-базы через backup API прямо в файл реплики.
+
+    Снимок согласован даже при параллельной записи в источник. Файл
+    реплики не подменяется: соединение-приёмник берёт блокировку на
+    запись, поэтому читатели, в том числе долгоживущие соединения
+    (CONN_MAX_AGE), видят либо старую, либо новую копию целиком, а
+    файлы -wal и -shm остаются согласованными с базой.
+    """
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+class Command(BaseCommand):
+    help = ('Скопировать основную SQLite-базу в файлы реплик из '
+            'REPLICA_DATABASES.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float,
+            help='Повторять копирование каждые N секунд.',
+        )
+
+    def handle(self, *args, **options):
+        replicas = settings.REPLICA_DATABASES
+        if not replicas:
+            raise CommandError(
+                'Реплики не настроены: задайте YATUBE_DB_REPLICAS')
+        source_path = settings.DATABASES[DEFAULT_DB_ALIAS]['NAME']
+        while True:
+            started = time.monotonic()
+            for alias in replicas:
+                copy_database(source_path, settings.DATABASES[alias]['NAME'])
+            bump_replica_generation()
+            self.stdout.write(
+                f'Реплики обновлены: {", ".join(replicas)} '
+                f'за {time.monotonic() - started:.2f} с')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = ('Прогреть процесс: скомпилировать шаблоны, построить '
+            'URL-резолверы и проверить соединения с базой.')
+
+    def handle(self, *args, **options):
+        timings = warm_up()
+        self.stdout.write(
+            f'Шаблонов скомпилировано: {timings["templates_compiled"]} '
+            f'за {timings["templates"]:.3f} с')
+        self.stdout.write(f'URL: {timings["urls"]:.3f} с')
+        self.stdout.write(f'База: {timings["database"]:.3f} с')
+        self.stdout.write(self.style.SUCCESS(
+            f'Прогрев занял {timings["warmup"]:.3f} с'))
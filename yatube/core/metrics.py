@@ -0,0 +1,174 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Имя метрики -> (описание, границы корзин гистограммы).
+METRICS = {
+    'yatube_request_duration_seconds': (
+        'Время обработки запроса', LATENCY_BUCKETS),
+    'yatube_db_queries': (
+        'Число SQL-запросов за запрос', QUERY_COUNT_BUCKETS),
+    'yatube_db_duration_seconds': (
+        'Время SQL-запросов за запрос', LATENCY_BUCKETS),
+    'yatube_template_render_seconds': (
+        'Время рендеринга шаблонов за запрос', LATENCY_BUCKETS),
+    'yatube_response_bytes': (
+        'Размер ответа', SIZE_BUCKETS),
+}
+
+_current = threading.local()
+
+
+class RequestStats:
+    """Счётчики одного запроса, их пополняют обёртки SQL и шаблонов."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+
+    def __enter__(self):
+        _current.stats = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _current.stats = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка для connection.execute_wrapper."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.queries += 1
+
+
+def record_template_render(seconds):
+    stats = getattr(_current, 'stats', None)
+    if stats is not None:
+        stats.template_seconds += seconds
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class Registry:
+    """Гистограммы процесса, сброшенные на диск для соседних процессов.
+
+    Каждый процесс пишет свой снимок в METRICS_DIR не чаще раза в
+    METRICS_FLUSH_SECONDS; endpoint метрик складывает снимки всех
+    процессов.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.last_flush = 0.0
+        self.filename = f'{os.getpid()}-{time.time_ns()}.json'
+
+    def observe(self, name, view, value):
+        buckets = METRICS[name][1]
+        with self.lock:
+            histogram = self.histograms.setdefault(name, {}).setdefault(
+                view, {'buckets': [0] * (len(buckets) + 1),
+                       'sum': 0.0, 'count': 0})
+            histogram['buckets'][bisect.bisect_left(buckets, value)] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return json.loads(json.dumps(self.histograms))
+
+    def flush(self, force=False):
+        directory = settings.METRICS_DIR
+        now = time.monotonic()
+        if not directory or (
+                not force
+                and now - self.last_flush < settings.METRICS_FLUSH_SECONDS):
+            return
+        self.last_flush = now
+        if os.getpid() != int(self.filename.split('-')[0]):
+            # Процесс форкнули после импорта: у потомка свой файл.
+            self.filename = f'{os.getpid()}-{time.time_ns()}.json'
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.filename)
+        with open(f'{path}.tmp', 'w') as snapshot_file:
+            json.dump(self.snapshot(), snapshot_file)
+        os.replace(f'{path}.tmp', path)
+
+    def collect(self):
+        """Сумма снимков всех процессов."""
+        self.flush(force=True)
+        directory = settings.METRICS_DIR
+        if not directory:
+            return self.snapshot()
+        merged = {}
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                if not process_alive(int(filename.split('-')[0])):
+                    # Снимки завершённых процессов удаляются, иначе
+                    # каталог растёт с каждым перезапуском воркеров.
+                    os.remove(path)
+                    continue
+                with open(path) as snapshot:
+                    histograms = json.load(snapshot)
+            except (OSError, ValueError):
+                continue
+            for name, views in histograms.items():
+                for view, histogram in views.items():
+                    total = merged.setdefault(name, {}).setdefault(
+                        view, {'buckets': [0] * len(histogram['buckets']),
+                               'sum': 0.0, 'count': 0})
+                    total['buckets'] = [
+                        a + b for a, b in zip(total['buckets'],
+                                              histogram['buckets'])]
+                    total['sum'] += histogram['sum']
+                    total['count'] += histogram['count']
+        return merged
+
+
+registry = Registry()
+
+
+def escape_label(value):
+    return (value.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def exposition(histograms):
+    """Текстовый формат Prometheus для гистограмм."""
+    lines = []
+    for name, (description, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} histogram')
+        for view, histogram in sorted(histograms.get(name, {}).items()):
+            label = f'view="{escape_label(view)}"'
+            cumulative = 0
+            bounds = [str(bound) for bound in buckets] + ['+Inf']
+            for bound, count in zip(bounds, histogram['buckets']):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label}}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{{label}}} {histogram["count"]}')
+    return '\n'.join(lines) + '\n'
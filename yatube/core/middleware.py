@@ -0,0 +1,197 @@
+import mimetypes
+import os
+import time
+from contextlib import ExitStack
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.db import connections
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.functional import cached_property
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .db_router import (replica_aliases, reset_write_flag, use_primary,
+                        wrote_to_primary)
+from .metrics import RequestStats, registry
+from .slow_queries import SlowQueryLogger
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# Файл с хэшем содержимого в имени никогда не меняется, его можно
+# кэшировать навсегда; файлы без хэша браузер перепроверяет раз в час.
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+STATIC_CACHE_CONTROL = 'public, max-age=3600'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding с весом q больше нуля.
+
+    Кодировка, не названная явно, принимается по правилу для "*".
+    """
+    weights = {}
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.lower()] = weight
+    wildcard = weights.pop('*', 0.0)
+    return {
+        coding for coding, _ in ENCODINGS
+        if weights.get(coding, wildcard) > 0
+    }
+
+
+class ReplicaStickyMiddleware:
+    """Читать с основной базы после собственной записи.
+
+    Запросы, изменяющие данные, целиком идут в основную базу. Если
+    запрос что-то записал, клиент получает cookie, и следующие
+    REPLICA_STICKY_SECONDS секунд его чтения тоже идут в основную базу:
+    так пользователь сразу видит свой пост, пока реплика догоняет.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+        sticky = (request.method not in SAFE_METHODS
+                  or settings.REPLICA_STICKY_COOKIE in request.COOKIES)
+        reset_write_flag()
+        if sticky:
+            with use_primary():
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+        if wrote_to_primary():
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS, httponly=True,
+                samesite='Lax')
+        return response
+
+
+class PrecompressedStaticMiddleware:
+    """Отдавать статику из STATIC_ROOT без отдельного веб-сервера.
+
+    Если клиент принимает brotli или gzip и collectstatic записал
+    сжатую копию, отдаётся она. Работает только без DEBUG, когда
+    статику не раздаёт runserver.
+    """
+
+    def __init__(self, get_response):
+        if settings.DEBUG or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    @cached_property
+    def hashed_names(self):
+        hashed_files = getattr(staticfiles_storage, 'hashed_files', {})
+        return frozenset(hashed_files.values())
+
+    def __call__(self, request):
+        if (request.method in ('GET', 'HEAD')
+                and request.path.startswith(settings.STATIC_URL)):
+            response = self.serve(
+                request, unquote(request.path[len(settings.STATIC_URL):]))
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        encoding = None
+        served_path = path
+        for candidate, suffix in ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding, served_path = candidate, path + suffix
+                break
+        stat = os.stat(served_path)
+        if not was_modified_since(
+                request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                stat.st_mtime, stat.st_size):
+            response = HttpResponseNotModified()
+        else:
+            content_type, _ = mimetypes.guess_type(path)
+            response = FileResponse(
+                open(served_path, 'rb'),
+                content_type=content_type or 'application/octet-stream')
+            response['Content-Length'] = stat.st_size
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = (
+            IMMUTABLE_CACHE_CONTROL if name in self.hashed_names
+            else STATIC_CACHE_CONTROL)
+        return response
+
+
+class MetricsMiddleware:
+    """Гистограммы времени, SQL, шаблонов и размера ответа по view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with RequestStats() as stats, ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        registry.observe('yatube_request_duration_seconds', view, duration)
+        registry.observe('yatube_db_queries', view, stats.queries)
+        registry.observe('yatube_db_duration_seconds', view,
+                         stats.db_seconds)
+        registry.observe('yatube_template_render_seconds', view,
+                         stats.template_seconds)
+        if not response.streaming:
+            registry.observe('yatube_response_bytes', view,
+                             len(response.content))
+        registry.flush()
+        return response
+
+
+class SlowQueryMiddleware:
+    """Писать запросы дольше SLOW_QUERY_THRESHOLD_MS в SLOW_QUERY_LOG.
+
+    Включается заданием SLOW_QUERY_LOG; сводку строит команда
+    slow_queries.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        logger = SlowQueryLogger(request, settings.SLOW_QUERY_LOG,
+                                 settings.SLOW_QUERY_THRESHOLD_MS)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(logger))
+            return self.get_response(request)
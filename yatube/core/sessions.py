@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore)
+
+KEY_PREFIX = 'core.sessions'
+
+
+class SessionStore(CachedDBStore):
+    """Сессии в кэше с отложенной записью в базу.
+
+    Чтение идёт из кэша, как в cached_db. Изменения попадают в базу не
+    чаще раза в SESSION_WRITE_BEHIND_SECONDS на сессию; создание
+    сессии, смена ключа при входе и удаление пишутся сразу. Допуск:
+    если кэш потеряет сессию раньше следующей записи, она откатится к
+    копии из базы - пользователь останется авторизован, но потеряет
+    изменения последних секунд (например, flash-сообщение). Кэш должен
+    быть общим для всех процессов, иначе выход из аккаунта в одном
+    процессе не увидят остальные.
+    """
+    cache_key_prefix = KEY_PREFIX
+
+    def synced_key(self, session_key):
+        return f'{self.cache_key_prefix}{session_key}:synced'
+
+    def save(self, must_create=False):
+        if (not must_create and self.session_key is not None
+                and self._cache.get(self.synced_key(self.session_key))):
+            self._cache.set(self.cache_key, self._session,
+                            self.get_expiry_age())
+            return
+        super().save(must_create)
+        self._cache.set(self.synced_key(self.session_key), True,
+                        settings.SESSION_WRITE_BEHIND_SECONDS)
+
+    def delete(self, session_key=None):
+        session_key = session_key or self.session_key
+        super().delete(session_key)
+        if session_key is not None:
+            self._cache.delete(self.synced_key(session_key))
@@ -0,0 +1,100 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.template.base import Node
+
+STACK_DEPTH = 5
+# Обёртки запросов и middleware проекта, их кадры ничего не объясняют.
+INSTRUMENTATION_FILES = frozenset(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ('slow_queries.py', 'metrics.py', 'middleware.py',
+                 'template_backend.py'))
+
+_write_lock = threading.Lock()
+
+
+def template_position():
+    """Шаблон и строка тега, который сейчас рендерится, или None.
+
+    Берётся ближайший к запросу узел шаблона: для include это
+    вложенный шаблон, а строка - строка тега, вызвавшего запрос.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        node = frame.f_locals.get('self')
+        # type(), а не isinstance: ленивый объект вроде request.user
+        # подгрузился бы на проверке и выполнил бы новый запрос.
+        if issubclass(type(node), Node) and getattr(node, 'origin', None):
+            return {
+                'name': node.origin.template_name,
+                'line': node.token.lineno if node.token else None,
+                'node': type(node).__name__,
+            }
+        frame = frame.f_back
+    return None
+
+
+def project_stack():
+    """Последние STACK_DEPTH кадров из кода проекта, без библиотек."""
+    base_dir = settings.BASE_DIR + os.sep
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir)
+        and frame.filename not in INSTRUMENTATION_FILES
+        and 'site-packages' not in frame.filename
+    ]
+    return [
+        f'{os.path.relpath(frame.filename, settings.BASE_DIR)}:'
+        f'{frame.lineno} in {frame.name}'
+        for frame in frames[-STACK_DEPTH:]
+    ]
+
+
+class SlowQueryLogger:
+    """execute_wrapper, который пишет медленные запросы в JSON lines."""
+
+    def __init__(self, request, path, threshold_ms):
+        self.request = request
+        self.path = path
+        self.threshold_ms = threshold_ms
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.log(sql, duration_ms, context)
+
+    def log(self, sql, duration_ms, context):
+        match = self.request.resolver_match
+        record = {
+            'time': time.time(),
+            'duration_ms': round(duration_ms, 3),
+            'database': context['connection'].alias,
+            'view': match.view_name if match else None,
+            'path': self.request.path,
+            'template': template_position(),
+            'stack': project_stack(),
+            'sql': sql,
+        }
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with _write_lock, open(self.path, 'a', encoding='utf-8') as log:
+            log.write(line)
+
+
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+
+
+def normalize_sql(sql):
+    """Убрать из SQL литералы, чтобы сгруппировать одинаковые запросы."""
+    sql = LITERAL_RE.sub('?', sql.replace('%s', '?'))
+    return IN_LIST_RE.sub('(...)', sql)
@@ -0,0 +1,26 @@
+import re
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+PRAGMA_NAME_RE = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE_RE = re.compile(r'^-?\w+$')
+
+
+def apply_pragmas(cursor, pragmas):
+    """Выполнить PRAGMA name = value для каждой пары из словаря."""
+    for name, value in pragmas.items():
+        if not (PRAGMA_NAME_RE.match(name)
+                and PRAGMA_VALUE_RE.match(str(value))):
+            raise ValueError(f'Недопустимая PRAGMA {name} = {value}')
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Настроить каждое новое SQLite-соединение по SQLITE_PRAGMAS."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, settings.SQLITE_PRAGMAS)
@@ -0,0 +1,57 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.xml', '.json', '.html',
+)
+# Сжатая копия, сэкономившая меньше этой доли, не записывается.
+MIN_COMPRESSION_GAIN = 0.05
+
+
+def compressors():
+    yield '.gz', lambda content: gzip.compress(content, 9, mtime=0)
+    if brotli is not None:
+        yield '.br', brotli.compress
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хэшами в именах плюс сжатые копии файлов.
+
+    Рядом с каждым текстовым файлом collectstatic пишет .gz, а если
+    установлен brotli - ещё и .br; их отдаёт PrecompressedStaticMiddleware.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed_names = set()
+        for name, hashed_name, processed in super().post_process(
+                paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                processed_names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in sorted(processed_names):
+            for compressed_name in self.compress(name):
+                yield name, compressed_name, True
+
+    def compress(self, name):
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as original:
+            content = original.read()
+        for suffix, compress in compressors():
+            compressed = compress(content)
+            if len(compressed) > len(content) * (1 - MIN_COMPRESSION_GAIN):
+                continue
+            compressed_name = name + suffix
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            self._save(compressed_name, ContentFile(compressed))
+            yield compressed_name
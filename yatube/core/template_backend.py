@@ -0,0 +1,30 @@
+import time
+
+from django.template.backends.django import DjangoTemplates, Template
+
+from .metrics import record_template_render
+
+
+class InstrumentedTemplate(Template):
+    """Шаблон, который сообщает время рендеринга в метрики запроса.
+
+    Замеряется только шаблон верхнего уровня: include и extends
+    рендерятся внутри него и в сумму не попадают дважды.
+    """
+
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            record_template_render(time.perf_counter() - started)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return InstrumentedTemplate(
+            super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return InstrumentedTemplate(
+            super().get_template(template_name).template, self)
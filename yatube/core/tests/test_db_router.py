@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.models import Session
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from posts.cache import versioned_listing
+from posts.counters import CachedCount
+from posts.models import Post
+
+from ..db_router import (PrimaryReplicaRouter, bump_replica_generation,
+                         pinned_to_primary, use_primary)
+from ..management.commands.sync_replica import copy_database
+from ..middleware import ReplicaStickyMiddleware
+
+REPLICAS = ['replica_1']
+
+
+@override_settings(REPLICA_DATABASES=REPLICAS)
+class RouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_go_to_replica(self):
+        """Чтение - из реплики, запись - в основную базу."""
+        self.assertEqual(self.router.db_for_read(Post), 'replica_1')
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+
+    def test_reads_pinned_to_primary(self):
+        """Привязка, сессии и открытая транзакция читают основную базу."""
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+        self.assertEqual(self.router.db_for_read(Session), 'default')
+        with mock.patch.object(connections['default'], 'in_atomic_block',
+                               True):
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_no_migrations_on_replica(self):
+        """Миграции применяются только к основной базе."""
+        self.assertFalse(self.router.allow_migrate('replica_1', 'posts'))
+        self.assertTrue(self.router.allow_migrate('default', 'posts'))
+
+
+@override_settings(REPLICA_DATABASES=REPLICAS)
+class StickyMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+
+    def run_view(self, request, writes=False):
+        read_from = []
+
+        def view(request):
+            if writes:
+                self.router.db_for_write(Post)
+            read_from.append(self.router.db_for_read(Post))
+            return HttpResponse()
+        response = ReplicaStickyMiddleware(view)(request)
+        return response, read_from[0]
+
+    def test_write_makes_reads_sticky(self):
+        """После записи клиент получает cookie и читает основную базу."""
+        response, db = self.run_view(self.factory.get('/'))
+        self.assertEqual(db, 'replica_1')
+        self.assertNotIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+
+        response, db = self.run_view(self.factory.post('/'), writes=True)
+        self.assertEqual(db, 'default')
+        cookie = response.cookies[settings.REPLICA_STICKY_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_STICKY_SECONDS)
+
+        request = self.factory.get('/')
+        request.COOKIES[settings.REPLICA_STICKY_COOKIE] = cookie.value
+        _, db = self.run_view(request)
+        self.assertEqual(db, 'default')
+
+
+@override_settings(REPLICA_DATABASES=REPLICAS, SHARED_CACHE=True)
+class VersionedReadsTests(SimpleTestCase):
+    """Кэш по версии области учитывает обновления реплик."""
+
+    def test_listing_reads_replica(self):
+        """Листинг читается с реплики, ETag меняется после её обновления."""
+        pinned = []
+
+        @versioned_listing(lambda: 'index')
+        def view(request):
+            pinned.append(pinned_to_primary())
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        etag = view(request)['ETag']
+        self.assertEqual(view(request)['ETag'], etag)
+        bump_replica_generation()
+        self.assertNotEqual(view(request)['ETag'], etag)
+        self.assertEqual(pinned, [False, False, False])
+
+    def test_cached_count_reads_primary(self):
+        """Промах CachedCount считает записи на основной базе."""
+        queryset = mock.Mock()
+        queryset.count.side_effect = lambda: int(pinned_to_primary())
+        count = CachedCount('test:count:primary', queryset)
+        count.reset()
+        self.assertEqual(count(), 1)
+        count.reset()
+
+
+class SyncReplicaTests(SimpleTestCase):
+    def test_copy_database(self):
+        """Открытое соединение реплики видит новую копию."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_path = os.path.join(tmpdir, 'primary.sqlite3')
+            target_path = os.path.join(tmpdir, 'replica.sqlite3')
+            source = sqlite3.connect(source_path)
+            source.execute('PRAGMA journal_mode = wal')
+            source.execute('CREATE TABLE posts (text TEXT)')
+            source.execute("INSERT INTO posts VALUES ('старый пост')")
+            source.commit()
+            copy_database(source_path, target_path)
+            replica = sqlite3.connect(target_path)
+            replica.execute('PRAGMA journal_mode = wal')
+            self.assertEqual(
+                replica.execute('SELECT COUNT(*) FROM posts').fetchone(),
+                (1,))
+
+            source.execute("INSERT INTO posts VALUES ('новый пост')")
+            source.commit()
+            source.close()
+            copy_database(source_path, target_path)
+
+            self.assertEqual(
+                replica.execute('SELECT text FROM posts').fetchall(),
+                [('старый пост',), ('новый пост',)])
+            replica.close()
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import User
+
+from ..metrics import Registry
+
+TOKEN = 'secret-token'
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.metrics_dir = tmpdir.name
+        settings_override = override_settings(
+            METRICS_DIR=self.metrics_dir, METRICS_TOKEN=TOKEN)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        registry = Registry()
+        for module in ('core.middleware', 'core.views'):
+            patcher = mock.patch(f'{module}.registry', registry)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = Client()
+
+    def scrape(self, **headers):
+        return self.client.get(reverse('metrics'), **headers)
+
+    def test_metrics_protected(self):
+        """Метрики доступны только по токену или персоналу."""
+        self.assertEqual(self.scrape().status_code, 403)
+        self.assertEqual(
+            self.scrape(HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(
+            self.scrape(HTTP_AUTHORIZATION=f'Bearer {TOKEN}').status_code,
+            200)
+        staff = User.objects.create_user(username='staff', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.scrape().status_code, 200)
+
+    def test_single_process_without_metrics_dir(self):
+        """Без METRICS_DIR снимки не пишутся на диск."""
+        with override_settings(METRICS_DIR=None):
+            self.client.get(reverse('posts:index'))
+            text = self.scrape(
+                HTTP_AUTHORIZATION=f'Bearer {TOKEN}').content.decode()
+        self.assertIn(
+            'yatube_request_duration_seconds_count{view="posts:index"} 1',
+            text)
+        self.assertEqual(os.listdir(self.metrics_dir), [])
+
+    def test_request_measured_per_view(self):
+        """Запрос к view попадает во все гистограммы с её именем."""
+        self.client.get(reverse('posts:index'))
+        text = self.scrape(
+            HTTP_AUTHORIZATION=f'Bearer {TOKEN}').content.decode()
+        for name in ('yatube_request_duration_seconds',
+                     'yatube_db_queries', 'yatube_db_duration_seconds',
+                     'yatube_template_render_seconds',
+                     'yatube_response_bytes'):
+            with self.subTest(metric=name):
+                self.assertIn(f'# TYPE {name} histogram', text)
+                self.assertIn(f'{name}_count{{view="posts:index"}} 1', text)
+        self.assertIn(
+            'yatube_db_queries_bucket{view="posts:index",le="+Inf"} 1', text)
+        template_sum = next(
+            line for line in text.splitlines()
+            if line.startswith(
+                'yatube_template_render_seconds_sum{view="posts:index"}'))
+        self.assertGreater(float(template_sum.split()[-1]), 0)
+
+    def test_snapshots_of_processes_merged(self):
+        """Снимки других живых процессов суммируются, мёртвых - удаляются."""
+        self.client.get(reverse('posts:index'))
+        self.scrape(HTTP_AUTHORIZATION=f'Bearer {TOKEN}')
+        own_file, = os.listdir(self.metrics_dir)
+        with open(os.path.join(self.metrics_dir, own_file)) as snapshot:
+            histograms = json.load(snapshot)
+        for filename in (f'{os.getppid()}-1.json', '999999999-1.json'):
+            with open(os.path.join(self.metrics_dir, filename), 'w') as copy:
+                json.dump(histograms, copy)
+
+        text = self.scrape(
+            HTTP_AUTHORIZATION=f'Bearer {TOKEN}').content.decode()
+        self.assertIn(
+            'yatube_request_duration_seconds_count{view="posts:index"} 2',
+            text)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.metrics_dir, '999999999-1.json')))
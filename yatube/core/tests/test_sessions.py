@@ -0,0 +1,91 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import User
+
+from ..sessions import SessionStore
+
+
+def session_queries(captured):
+    return [query['sql'] for query in captured.captured_queries
+            if 'django_session' in query['sql']]
+
+
+@override_settings(SESSION_ENGINE='core.sessions')
+class WriteBehindSessionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='session_user')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_authorized_request_skips_session_table(self):
+        """Сессия авторизованного пользователя читается из кэша."""
+        client = Client()
+        client.force_login(self.user)
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session_queries(captured), [])
+
+    def test_changes_written_behind(self):
+        """Изменения попадают в базу не чаще раза за интервал."""
+        session = SessionStore()
+        session['step'] = 1
+        session.create()
+        session['step'] = 2
+        with CaptureQueriesContext(connection) as captured:
+            session.save()
+        self.assertEqual(session_queries(captured), [])
+        self.assertEqual(SessionStore(session.session_key)['step'], 2)
+        stored = Session.objects.get(session_key=session.session_key)
+        self.assertEqual(stored.get_decoded()['step'], 1)
+
+        cache.delete(session.synced_key(session.session_key))
+        session['step'] = 3
+        session.save()
+        stored = Session.objects.get(session_key=session.session_key)
+        self.assertEqual(stored.get_decoded()['step'], 3)
+
+    def test_delete_is_immediate(self):
+        """Удаление сессии сразу убирает её из базы и кэша."""
+        session = SessionStore()
+        session.create()
+        session.delete()
+        self.assertFalse(Session.objects.filter(
+            session_key=session.session_key).exists())
+        self.assertFalse(SessionStore().exists(session.session_key))
+
+
+class ClearExpiredSessionsTests(TestCase):
+    def test_deletes_only_expired_in_batches(self):
+        """Истёкшие сессии удаляются пачками, живые остаются."""
+        now = timezone.now()
+        Session.objects.bulk_create(
+            [Session(session_key=f'expired{i}', session_data='',
+                     expire_date=now - timedelta(days=1))
+             for i in range(5)]
+            + [Session(session_key='alive', session_data='',
+                       expire_date=now + timedelta(days=1))])
+        output = StringIO()
+        with CaptureQueriesContext(connection) as captured:
+            call_command('clear_expired_sessions', batch_size=2,
+                         stdout=output)
+        deletes = [query for query in session_queries(captured)
+                   if query.startswith('DELETE')]
+        self.assertEqual(len(deletes), 3)
+        self.assertIn('Удалено истёкших сессий: 5', output.getvalue())
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            ['alive'])
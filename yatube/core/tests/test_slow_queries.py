@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from ..slow_queries import normalize_sql
+
+
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='slow_author')
+        Post.objects.create(text='Пост', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.log_path = os.path.join(tmpdir.name, 'slow.jsonl')
+
+    def read_log(self):
+        with open(self.log_path, encoding='utf-8') as log:
+            return [json.loads(line) for line in log]
+
+    def test_queries_attributed_to_view_and_template(self):
+        """Запись журнала знает view, шаблон и строку в posts/views.py."""
+        profile_url = reverse('posts:profile', args=[self.author.username])
+        with override_settings(SLOW_QUERY_LOG=self.log_path,
+                               SLOW_QUERY_THRESHOLD_MS=0):
+            Client().get(profile_url)
+        records = self.read_log()
+        self.assertTrue(records)
+        self.assertEqual({record['view'] for record in records},
+                         {'posts:profile'})
+        from_template = [record for record in records
+                         if record['template']]
+        self.assertTrue(from_template)
+        self.assertEqual(from_template[0]['template']['name'],
+                         'posts/profile.html')
+        self.assertTrue(any(frame.startswith('posts/views.py:')
+                            for frame in from_template[0]['stack']))
+
+    def test_threshold_and_opt_in(self):
+        """Без SLOW_QUERY_LOG или ниже порога ничего не пишется."""
+        Client().get(reverse('posts:index'))
+        with override_settings(SLOW_QUERY_LOG=self.log_path,
+                               SLOW_QUERY_THRESHOLD_MS=10 ** 6):
+            Client().get(reverse('posts:index'))
+        self.assertFalse(os.path.exists(self.log_path))
+
+    def test_summary_command(self):
+        """slow_queries группирует запросы по месту вызова."""
+        with override_settings(SLOW_QUERY_LOG=self.log_path,
+                               SLOW_QUERY_THRESHOLD_MS=0):
+            client = Client()
+            for _ in range(3):
+                cache.clear()
+                client.get(reverse('posts:index'))
+        output = StringIO()
+        call_command('slow_queries', self.log_path, sort='count', limit=1,
+                     stdout=output)
+        self.assertIn('posts:index', output.getvalue())
+        self.assertIn('3 раз', output.getvalue())
+
+    def test_normalize_sql(self):
+        """Литералы и списки IN не дробят группы."""
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (1, 2, 3) "
+                          "AND name = 'x' AND c = %s"),
+            'SELECT * FROM t WHERE id IN (...) AND name = ? AND c = ?')
@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from ..sqlite import apply_pragmas
+
+
+class SqlitePragmaTests(TestCase):
+    def test_pragmas_applied_to_connection(self):
+        """Новое соединение получает PRAGMA из SQLITE_PRAGMAS."""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            # NORMAL
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_unsafe_pragma_rejected(self):
+        """Значение PRAGMA не может содержать лишний SQL."""
+        with connection.cursor() as cursor:
+            with self.assertRaises(ValueError):
+                apply_pragmas(cursor, {'cache_size': '1; DROP TABLE x'})
+
+
+class SqliteBenchmarkTests(SimpleTestCase):
+    def test_benchmark_reports_profiles(self):
+        """benchmark_sqlite замеряет все профили на временной базе."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report_path = os.path.join(tmpdir, 'report.json')
+            call_command('benchmark_sqlite', workers=2, duration=0.2,
+                         rows=100, output=report_path, stdout=StringIO())
+            with open(report_path) as report_file:
+                report = json.load(report_file)
+        self.assertEqual(set(report['results']),
+                         {'default', 'pragmas', 'tuned'})
+        for name, result in report['results'].items():
+            with self.subTest(profile=name):
+                self.assertGreater(result['ops_per_second'], 0)
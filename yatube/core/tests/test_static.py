@@ -0,0 +1,85 @@
+import gzip
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import Client, SimpleTestCase, override_settings
+
+from ..middleware import IMMUTABLE_CACHE_CONTROL, STATIC_CACHE_CONTROL
+
+CSS = 'css/bootstrap.min.css'
+
+
+class PrecompressedStaticTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.TemporaryDirectory()
+        cls.settings_override = override_settings(
+            STATIC_ROOT=cls.static_root.name,
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'),
+        )
+        cls.settings_override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0,
+                     stdout=StringIO())
+        cls.hashed_css = staticfiles_storage.stored_name(CSS)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.static_root.cleanup()
+        super().tearDownClass()
+
+    def test_collectstatic_writes_gzip_copies(self):
+        """collectstatic пишет хэшированные имена и .gz рядом с ними."""
+        self.assertNotEqual(self.hashed_css, CSS)
+        path = os.path.join(self.static_root.name, self.hashed_css)
+        with open(path, 'rb') as original, \
+                gzip.open(path + '.gz', 'rb') as compressed:
+            self.assertEqual(compressed.read(), original.read())
+        self.assertFalse(os.path.exists(os.path.join(
+            self.static_root.name, 'img/logo.png.gz')))
+
+    def test_middleware_serves_compressed_variant(self):
+        """Клиент с gzip получает сжатую копию с вечным кэшем."""
+        client = Client()
+        response = client.get(f'/static/{self.hashed_css}',
+                              HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['Content-Type'], 'text/css')
+        body = b''.join(response.streaming_content)
+        self.assertTrue(gzip.decompress(body))
+
+        response = client.get(f'/static/{self.hashed_css}')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = client.get(f'/static/{CSS}')
+        self.assertEqual(response['Cache-Control'], STATIC_CACHE_CONTROL)
+
+    def test_middleware_respects_zero_weight(self):
+        """Кодировка с q=0 не отдаётся, даже если названа в заголовке."""
+        client = Client()
+        for header in ('gzip;q=0, br;q=0', 'gzip; q=0.0, deflate',
+                       '*;q=0', 'gzip;q=0, *'):
+            with self.subTest(header=header):
+                response = client.get(f'/static/{self.hashed_css}',
+                                      HTTP_ACCEPT_ENCODING=header)
+                self.assertFalse(response.has_header('Content-Encoding'))
+        response = client.get(f'/static/{self.hashed_css}',
+                              HTTP_ACCEPT_ENCODING='br;q=0, gzip;q=0.5')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_middleware_revalidation_and_traversal(self):
+        """If-Modified-Since даёт 304, выход за STATIC_ROOT - мимо."""
+        client = Client()
+        response = client.get(f'/static/{self.hashed_css}')
+        response = client.get(
+            f'/static/{self.hashed_css}',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        response = client.get('/static/../manage.py')
+        self.assertEqual(response.status_code, 404)
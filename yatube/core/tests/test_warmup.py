@@ -0,0 +1,63 @@
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections
+from django.template import engines
+from django.test import TestCase, override_settings
+from django.urls import get_resolver
+
+from ..warmup import template_names, warm_connections, warm_up
+
+CACHED_TEMPLATES = [dict(
+    settings.TEMPLATES[0],
+    OPTIONS=dict(settings.TEMPLATES[0]['OPTIONS'], loaders=[
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]),
+)]
+
+
+class WarmupTests(TestCase):
+    @override_settings(TEMPLATES=CACHED_TEMPLATES)
+    def test_templates_compiled_into_cache(self):
+        """После прогрева шаблоны проекта и приложений уже в кэше."""
+        engine = engines['django']
+        names = template_names(engine)
+        self.assertIn('posts/index.html', names)
+        self.assertIn('admin/base.html', names)
+
+        timings = warm_up()
+
+        self.assertEqual(timings['templates_compiled'], len(names))
+        cache = engine.engine.template_loaders[0].get_template_cache
+        self.assertIn('posts/index.html', cache)
+
+    def test_resolver_populated(self):
+        """Прогрев строит словари reverse заранее."""
+        warm_up()
+        self.assertIn('posts', get_resolver().namespace_dict)
+
+    def test_connections_closed_before_fork(self):
+        """Прогрев не оставляет открытых соединений для fork."""
+        with mock.patch.object(connections, 'close_all') as close_all:
+            warm_up()
+        close_all.assert_called_once_with()
+
+    def test_worker_opens_only_persistent_connections(self):
+        """После fork открываются только постоянные соединения."""
+        with self.assertNumQueries(0):
+            warm_connections()
+        with mock.patch.dict(connections.databases['default'],
+                             CONN_MAX_AGE=60):
+            with self.assertNumQueries(1):
+                warm_connections()
+
+    def test_command_reports_timings(self):
+        """Команда warmup печатает длительность прогрева."""
+        output = StringIO()
+        call_command('warmup', stdout=output)
+        self.assertIn('Прогрев занял', output.getvalue())
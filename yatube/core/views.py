@@ -0,0 +1,27 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .metrics import exposition, registry
+
+
+def metrics_allowed(request):
+    if request.user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(token) and hmac.compare_digest(
+        authorization.encode(), f'Bearer {token}'.encode())
+
+
+def metrics(request):
+    """Метрики всех процессов в текстовом формате Prometheus.
+
+    Доступны персоналу или по заголовку Authorization: Bearer
+    с METRICS_TOKEN.
+    """
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(exposition(registry.collect()),
+                        content_type='text/plain; version=0.0.4')
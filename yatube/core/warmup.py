@@ -0,0 +1,109 @@
+import logging
+import os
+import time
+
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+from django.urls import URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def template_names(engine):
+    """Имена всех шаблонов из DIRS и templates/ приложений."""
+    dirs = list(engine.engine.dirs) + list(get_app_template_dirs('templates'))
+    names = set()
+    for template_dir in dirs:
+        for root, _, files in os.walk(template_dir):
+            for filename in files:
+                if filename.endswith(TEMPLATE_EXTENSIONS):
+                    names.add(os.path.relpath(
+                        os.path.join(root, filename), template_dir))
+    return sorted(names)
+
+
+def compile_templates():
+    """Скомпилировать шаблоны в кэш загрузчика, вернуть их число."""
+    compiled = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                logger.warning('Шаблон %s не скомпилирован: %s', name, error)
+                continue
+            compiled += 1
+    return compiled
+
+
+def populate_resolver(resolver=None):
+    """Построить словари reverse у корневого и вложенных резолверов."""
+    resolver = resolver or get_resolver()
+    resolver.reverse_dict
+    resolver.namespace_dict
+    resolver.app_dict
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            populate_resolver(pattern)
+
+
+def open_connections(aliases=None):
+    """Выполнить SELECT 1 на соединениях aliases, по умолчанию на всех."""
+    for alias in aliases or connections:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+
+def warm_connections():
+    """Открыть в воркере постоянные соединения (CONN_MAX_AGE не 0).
+
+    Вызывается после fork, см. yatube/gunicorn.conf.py. Соединения с
+    CONN_MAX_AGE = 0 закрылись бы на первом же запросе.
+    """
+    aliases = [
+        alias for alias in connections
+        if connections.databases[alias]['CONN_MAX_AGE'] != 0
+    ]
+    if aliases:
+        open_connections(aliases)
+
+
+def warm_up(started=None):
+    """Прогреть шаблоны, URL и проверить соединения с базой.
+
+    Возвращает длительность шагов в секундах; started - момент
+    начала запуска процесса по time.monotonic(), чтобы в отчёт
+    попало и время импорта Django.
+    """
+    timings = {}
+    steps = (
+        ('templates', compile_templates),
+        ('urls', populate_resolver),
+        ('database', open_connections),
+    )
+    warmup_started = time.monotonic()
+    for name, step in steps:
+        step_started = time.monotonic()
+        result = step()
+        timings[name] = time.monotonic() - step_started
+        if name == 'templates':
+            timings['templates_compiled'] = result
+    # Процесс может ещё разветвиться (gunicorn --preload), а соединения
+    # SQLite нельзя делить между процессами.
+    connections.close_all()
+    finished = time.monotonic()
+    timings['warmup'] = finished - warmup_started
+    timings['startup'] = finished - (started or warmup_started)
+    logger.info(
+        'Прогрев за %.3f с (запуск %.3f с): шаблоны %d за %.3f с, '
+        'URL %.3f с, база %.3f с',
+        timings['warmup'], timings['startup'],
+        timings['templates_compiled'], timings['templates'],
+        timings['urls'], timings['database'])
+    return timings
@@ -0,0 +1,8 @@
+# Настройки gunicorn: gunicorn -c gunicorn.conf.py yatube.wsgi
+# С --preload шаблоны и URL прогреваются один раз в мастере
+# (yatube/wsgi.py), а соединения с базой открывает каждый воркер.
+
+
+def post_fork(server, worker):
+    from core.warmup import warm_connections
+    warm_connections()
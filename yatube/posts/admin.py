@@ -1,16 +1,48 @@
 from django.contrib import admin
 
+from posts.counters import total_post_count
+from posts.forms import GroupSelect, use_cached_group_choices
 from posts.models import Post
 from posts.models import Group
+from posts.paginator import PostPaginator
+
+# Больше стольких постов под фильтром админка не считает: дальние
+# страницы отфильтрованного списка недоступны, зато COUNT ограничен.
+ADMIN_COUNT_LIMIT = 10000
 
 
 class PostAdmin(admin.ModelAdmin):
     list_editable = ('group',)
     list_display = ('pk', 'text', 'pub_date', 'author', 'group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    # Ссылки по датам строит indexed_date_hierarchy из шаблона
+    # admin/posts/post/change_list.html.
+    date_hierarchy = 'pub_date'
+    autocomplete_fields = ('author',)
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
+    def get_paginator(self, request, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True):
+        if queryset.query.where:
+            def count():
+                return queryset.order_by()[:ADMIN_COUNT_LIMIT].count()
+        else:
+            count = total_post_count
+        return PostPaginator(queryset, per_page, count=count,
+                             orphans=orphans,
+                             allow_empty_first_page=allow_empty_first_page)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super().formfield_for_foreignkey(
+            db_field, request, **kwargs)
+        if db_field.name == 'group':
+            # Список групп в каждой строке собирается из кэша процесса.
+            use_cached_group_choices(formfield, GroupSelect)
+        return formfield
+
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
@@ -0,0 +1,135 @@
+from functools import wraps
+
+from django.http import JsonResponse
+from django.views.decorators.http import condition, require_safe
+
+from .cache import (INDEX_SCOPE, group_scope, post_etag, profile_scope,
+                    versioned_listing)
+from .models import Group, Post, User
+from .paginator import POSTS_ON_PAGE, paginate_by_cursor
+
+API_MAX_LIMIT = 100
+
+# Поле ответа -> (колонки для only(), способ достать значение).
+API_FIELDS = {
+    'id': (('id',), lambda post: post.pk),
+    'pub_date': (('pub_date',), lambda post: post.pub_date),
+    'updated_at': (('updated_at',), lambda post: post.updated_at),
+    'text': (('text',), lambda post: post.text),
+    'author': (('author', 'author__username'),
+               lambda post: post.author.username),
+    'group': (('group', 'group__slug'),
+              lambda post: post.group_id and post.group.slug),
+}
+# Без них не построить курсор и не сослаться на пост.
+REQUIRED_FIELDS = ('id', 'pub_date')
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def api_view(view):
+    """Только GET/HEAD, ошибки ApiError отдаются как JSON."""
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({'detail': str(error)}, status=error.status)
+    return wrapper
+
+
+def requested_fields(request):
+    fields = request.GET.get('fields')
+    if not fields:
+        return tuple(API_FIELDS)
+    fields = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = set(fields) - set(API_FIELDS)
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(sorted(unknown))}')
+    return tuple(dict.fromkeys(REQUIRED_FIELDS + tuple(fields)))
+
+
+def requested_limit(request):
+    try:
+        limit = int(request.GET.get('limit', POSTS_ON_PAGE))
+    except ValueError:
+        raise ApiError('limit должен быть числом')
+    if not 1 <= limit <= API_MAX_LIMIT:
+        raise ApiError(f'limit должен быть от 1 до {API_MAX_LIMIT}')
+    return limit
+
+
+def sparse(post_list, fields):
+    """Загрузить только колонки запрошенных полей."""
+    columns = [column for field in fields for column in API_FIELDS[field][0]]
+    related = [field for field in ('author', 'group') if field in fields]
+    if related:
+        post_list = post_list.select_related(*related)
+    return post_list.only(*columns)
+
+
+def serialize(post, fields):
+    return {field: API_FIELDS[field][1](post) for field in fields}
+
+
+def page_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['cursor'] = cursor
+    return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+
+def post_list_response(request, post_list):
+    fields = requested_fields(request)
+    page = paginate_by_cursor(sparse(post_list, fields),
+                              request.GET.get('cursor'),
+                              requested_limit(request))
+    return JsonResponse({
+        'results': [serialize(post, fields) for post in page],
+        'next': page_url(request, page.next_cursor),
+        'previous': page_url(request, page.previous_cursor),
+    }, json_dumps_params={'ensure_ascii': False})
+
+
+@api_view
+@versioned_listing(lambda: INDEX_SCOPE)
+def posts(request):
+    return post_list_response(request, Post.objects.all())
+
+
+@api_view
+@versioned_listing(group_scope)
+def group_posts(request, slug):
+    group_id = Group.objects.filter(slug=slug).values_list(
+        'pk', flat=True).first()
+    if group_id is None:
+        raise ApiError('Группа не найдена', status=404)
+    return post_list_response(request, Post.objects.filter(group_id=group_id))
+
+
+@api_view
+@versioned_listing(profile_scope)
+def author_posts(request, username):
+    author_id = User.objects.filter(username=username).values_list(
+        'pk', flat=True).first()
+    if author_id is None:
+        raise ApiError('Автор не найден', status=404)
+    return post_list_response(
+        request, Post.objects.filter(author_id=author_id))
+
+
+@api_view
+@condition(etag_func=post_etag)
+def post_detail(request, post_id):
+    fields = requested_fields(request)
+    post = sparse(Post.objects.filter(pk=post_id), fields).first()
+    if post is None:
+        raise ApiError('Пост не найден', status=404)
+    return JsonResponse(serialize(post, fields),
+                        json_dumps_params={'ensure_ascii': False})
@@ -0,0 +1,137 @@
+import math
+import statistics
+import time
+from contextlib import nullcontext
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .bulk import invalidate_after_bulk_insert
+from .models import Group, Post, User
+from .paginator import POSTS_ON_PAGE
+
+
+class Target:
+    """Один замер: view, адрес и от чьего имени его открывать."""
+
+    def __init__(self, name, url, method='get', data=None, user=None,
+                 writes=False):
+        self.name = name
+        self.url = url
+        self.method = method
+        self.data = data
+        self.user = user
+        self.writes = writes
+
+
+def default_targets():
+    """Цели для всех view posts на самых тяжёлых данных из базы."""
+    post = Post.objects.order_by('-id').select_related('author').first()
+    if post is None:
+        return []
+    group = Group.objects.annotate(
+        posts_total=Count('posts')).order_by('-posts_total').first()
+    author = User.objects.annotate(
+        posts_total=Count('posts')).order_by('-posts_total').first()
+    own_post = author.posts.order_by('-id').first()
+    deep_page = max(1, Post.objects.count() // POSTS_ON_PAGE // 2)
+    targets = []
+    for user, suffix in ((None, 'anonymous'), (author, 'authorized')):
+        targets += [
+            Target(f'index:{suffix}', reverse('posts:index'), user=user),
+            Target(f'index_deep:{suffix}',
+                   reverse('posts:index') + f'?page={deep_page}', user=user),
+            Target(f'profile:{suffix}',
+                   reverse('posts:profile', args=[author.username]),
+                   user=user),
+            Target(f'post_detail:{suffix}',
+                   reverse('posts:post_detail', args=[post.pk]), user=user),
+        ]
+        if group is not None:
+            targets.append(Target(
+                f'group_posts:{suffix}',
+                reverse('posts:group_posts', args=[group.slug]), user=user))
+    targets += [
+        Target('post_create:get', reverse('posts:post_create'), user=author),
+        Target('post_create:post', reverse('posts:post_create'),
+               method='post', data={'text': 'Пост из бенчмарка'},
+               user=author, writes=True),
+        Target('post_edit:get',
+               reverse('posts:post_edit', args=[own_post.pk]), user=author),
+    ]
+    return targets
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def measure(target, iterations, warmup, host):
+    client = Client(SERVER_NAME=host)
+    if target.user is not None:
+        client.force_login(target.user)
+    request = getattr(client, target.method)
+    timings = []
+    queries = []
+    sizes = []
+    # Записи бенчмарка откатываются, чтобы не копиться между запусками.
+    with transaction.atomic() if target.writes else nullcontext():
+        for iteration in range(warmup + iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = request(target.url, data=target.data)
+                elapsed = time.perf_counter() - started
+            if iteration < warmup:
+                continue
+            timings.append(elapsed * 1000)
+            queries.append(len(captured.captured_queries))
+            sizes.append(len(response.content))
+        if target.writes:
+            transaction.set_rollback(True)
+    if target.writes:
+        invalidate_after_bulk_insert(authors=[target.user])
+    return {
+        'status': response.status_code,
+        'median_ms': round(statistics.median(timings), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'requests_per_second': round(len(timings) * 1000 / sum(timings), 1),
+        'queries': max(queries),
+        'bytes': max(sizes),
+    }
+
+
+def run(targets, iterations, warmup=3, host='localhost'):
+    return {
+        'posts': Post.objects.count(),
+        'iterations': iterations,
+        'results': {
+            target.name: measure(target, iterations, warmup, host)
+            for target in targets
+        },
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Список регрессий относительно базового отчёта.
+
+    Регрессия - медиана или p99 хуже базовых больше чем на tolerance
+    (доля), либо больше SQL-запросов.
+    """
+    regressions = []
+    for name, result in report['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        for metric in ('median_ms', 'p99_ms'):
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f'{name}: {metric} {base[metric]} -> {result[metric]}')
+        if result['queries'] > base['queries']:
+            regressions.append(
+                f'{name}: queries {base["queries"]} -> {result["queries"]}')
+    return regressions
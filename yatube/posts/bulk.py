@@ -0,0 +1,34 @@
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+from .cache import INDEX_SCOPE, group_scope, invalidate_scopes, profile_scope
+from .counters import INDEX_COUNT_KEY, group_count_key
+from .models import Post
+
+
+@contextmanager
+def explicit_pub_date():
+    """Разрешить bulk_create сохранить заданный pub_date.
+
+    auto_now_add перезаписывает дату при любой вставке, а при переносе
+    и генерации данных нужны исходные даты. Только для management-команд:
+    флаг поля общий для всего процесса.
+    """
+    field = Post._meta.get_field('pub_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def invalidate_after_bulk_insert(groups=(), authors=()):
+    """Сбросить кэш листингов после вставки в обход сигналов."""
+    invalidate_scopes(
+        INDEX_SCOPE,
+        *(group_scope(group.slug) for group in groups),
+        *(profile_scope(author.username) for author in authors),
+    )
+    cache.delete_many(
+        [INDEX_COUNT_KEY] + [group_count_key(group.pk) for group in groups])
@@ -0,0 +1,204 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from core.db_router import replica_generation
+
+from .counters import INDEX_COUNT_KEY, CachedCount, group_count_key
+from .models import Follow, Group, Post, User
+
+PAGE_CACHE_TIMEOUT = 60 * 60
+SCOPE_VERSION_TIMEOUT = None
+
+INDEX_SCOPE = 'index'
+# Список групп для форм, см. posts.forms.group_choices.
+GROUPS_SCOPE = 'groups'
+
+
+def group_scope(slug):
+    return f'group:{slug}'
+
+
+def profile_scope(username):
+    return f'profile:{username}'
+
+
+def _version_key(scope):
+    # В области бывают слаги и имена не в ASCII, а memcached принимает
+    # только ASCII-ключи без пробелов.
+    return 'posts:scope:' + hashlib.md5(scope.encode()).hexdigest()
+
+
+def get_scope_version(scope):
+    """Текущая версия области кэша.
+
+    Начальная версия - текущее время, поэтому после вытеснения ключа
+    версии из кэша старые страницы не оживут.
+    """
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), SCOPE_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_scopes(*scopes):
+    for scope in set(scopes):
+        try:
+            cache.incr(_version_key(scope))
+        except ValueError:
+            cache.set(_version_key(scope), time.time_ns(),
+                      SCOPE_VERSION_TIMEOUT)
+
+
+def page_cache_key(view_name, scope, request):
+    raw = '|'.join((
+        view_name,
+        scope,
+        str(get_scope_version(scope)),
+        str(replica_generation()),
+        request.GET.get('page', ''),
+        'cursor' if 'cursor' in request.GET else 'page',
+        request.GET.get('cursor', ''),
+    ))
+    return 'posts:page:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def scope_validators(scope, user):
+    """Что показывает листинг области, по данным базы.
+
+    Нужно без общего кэша, когда версии областей у процессов свои:
+    время последней правки поста, число постов и шапка страницы. Новые,
+    изменённые и удалённые посты меняют результат сразу (число постов -
+    в пределах LOCAL_COUNT_TIMEOUT), а переименование автора или группы
+    в другом процессе попадёт в ETag только со следующей правкой поста
+    области.
+    """
+    kind, _, value = scope.partition(':')
+    if kind == 'group':
+        group = Group.objects.filter(slug=value).values_list(
+            'pk', 'title', 'description').first()
+        if group is None:
+            return (None,)
+        posts = Post.objects.filter(group_id=group[0])
+        count = CachedCount(group_count_key(group[0]), posts)()
+        header = group
+    elif kind == 'profile':
+        author = User.objects.filter(username=value).values_list(
+            'pk', 'first_name', 'last_name',
+            'post_counter__posts_count').first()
+        if author is None:
+            return (None,)
+        posts = Post.objects.filter(author_id=author[0])
+        count = None
+        following = (
+            user.is_authenticated and user.pk != author[0]
+            and Follow.objects.filter(user=user, author_id=author[0]).exists()
+        )
+        header = author + (following,)
+    else:
+        posts = Post.objects.all()
+        count = CachedCount(INDEX_COUNT_KEY, posts)()
+        header = ()
+    updated = posts.aggregate(updated=Max('updated_at'))['updated']
+    return (updated, count) + tuple(header)
+
+
+def listing_etag(scope_func):
+    """ETag листинга из версии его области кэша.
+
+    В ETag входят поколение реплик, страница или курсор, пользователь
+    (шапка страницы зависит от него) и год из подвала. С общим кэшем
+    (SHARED_CACHE) версия области обходится без запросов к базе; без
+    него версию сменит только процесс, выполнивший запись, и вместо неё
+    берётся scope_validators.
+    """
+    def etag(request, *args, **kwargs):
+        scope = scope_func(*args, **kwargs)
+        if settings.SHARED_CACHE:
+            version = (get_scope_version(scope), replica_generation())
+        else:
+            version = scope_validators(scope, request.user)
+        raw = '|'.join((
+            scope,
+            *map(str, version),
+            request.GET.get('page', ''),
+            'cursor' if 'cursor' in request.GET else 'page',
+            request.GET.get('cursor', ''),
+            str(request.user.pk),
+            str(timezone.now().year),
+        ))
+        return hashlib.md5(raw.encode()).hexdigest()
+    return etag
+
+
+def versioned_listing(scope_func):
+    """Условный GET листинга по listing_etag.
+
+    Листинг читается с реплики. Сигналы меняют версию области сразу
+    после записи в основную базу, и отстающая реплика может отдать под
+    новой версией старый листинг; поэтому в ETag и ключ кэша страниц
+    входит replica_generation, и такой листинг живёт только до
+    следующего обновления реплик.
+    """
+    return condition(etag_func=listing_etag(scope_func))
+
+
+def post_etag(request, post_id):
+    """ETag страницы поста: одна выборка по первичному ключу.
+
+    Вместо текста поста берётся updated_at, плюс всё, что страница
+    показывает об авторе и группе.
+    """
+    validators = Post.objects.filter(pk=post_id).values_list(
+        'updated_at',
+        'author__username',
+        'author__first_name',
+        'author__last_name',
+        'author__post_counter__posts_count',
+        'group__slug',
+        'group__title',
+    ).first()
+    if validators is None:
+        return None
+    raw = '|'.join(map(str, validators + (
+        request.user.pk, timezone.now().year)))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def cache_page_for_anonymous(scope_func):
+    """Кэшировать страницу для анонимных пользователей.
+
+    scope_func получает аргументы view и возвращает область кэша;
+    страница живёт, пока версия области не сменится. Работает только с
+    общим для процессов кэшем (SHARED_CACHE).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (not settings.SHARED_CACHE
+                    or request.method not in ('GET', 'HEAD')
+                    or request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+            key = page_cache_key(
+                view.__name__, scope_func(*args, **kwargs), request)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+            response = view(request, *args, **kwargs)
+            if (response.status_code == 200 and not response.streaming
+                    and not response.cookies):
+                cache.set(key, (response.content, response['Content-Type']),
+                          PAGE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from core.db_router import use_primary
+
+from .models import Post, PostCounter
+
+RECOUNT_BATCH_SIZE = 1000
+COUNT_CACHE_TIMEOUT = 60 * 60
+# Срок счётчика в кэше, который не общий для процессов.
+LOCAL_COUNT_TIMEOUT = 30
+
+INDEX_COUNT_KEY = 'posts:count:index'
+
+
+def group_count_key(group_id):
+    return f'posts:count:group:{group_id}'
+
+
+class CachedCount:
+    """Число постов листинга из кэша вместо SELECT COUNT(*).
+
+    Значение считается точно при промахе, дальше сигналы сдвигают его
+    на ±1 при создании, удалении и переносе постов. Допуск: записи в
+    обход сигналов (bulk_create, QuerySet.update) и гонка между
+    промахом и сдвигом дают расхождение, которое живёт не дольше
+    COUNT_CACHE_TIMEOUT или до первой страницы, выдавшей себя
+    (см. posts.paginator.paginate). Без общего кэша (SHARED_CACHE)
+    сдвиги из других процессов не видны, поэтому счётчик живёт в кэше
+    процесса LOCAL_COUNT_TIMEOUT: записи других процессов появляются в
+    числе не позже чем через столько секунд.
+    """
+
+    def __init__(self, key, queryset):
+        self.key = key
+        self.queryset = queryset
+
+    def __call__(self):
+        count = cache.get(self.key)
+        if count is None:
+            # Сигналы сдвигают счётчик от записей в основную базу,
+            # поэтому и считать его нужно там, а не на реплике.
+            with use_primary():
+                count = self.queryset.count()
+            cache.add(self.key, count,
+                      COUNT_CACHE_TIMEOUT if settings.SHARED_CACHE
+                      else LOCAL_COUNT_TIMEOUT)
+        return count
+
+    def reset(self):
+        cache.delete(self.key)
+
+
+def total_post_count():
+    """Число всех постов по счётчикам авторов, без COUNT(*) по постам.
+
+    Расходится с таблицей так же, как PostCounter; исправляет
+    recount_posts.
+    """
+    return PostCounter.objects.aggregate(
+        total=Sum('posts_count'))['total'] or 0
+
+
+def change_cached_counts(deltas):
+    """Сдвинуть закэшированные счётчики: deltas - {ключ: delta}."""
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # Ключа нет: следующее чтение посчитает точно.
+            pass
+
+
+def change_post_count(author_id, delta):
+    """Атомарно сдвинуть счётчик постов автора на delta.
+
+    Сигналы вызывают его в транзакции Post.save и удаления, поэтому
+    откат записи откатывает и счётчик. Расхождения от записей в обход
+    сигналов исправляет команда recount_posts.
+    """
+    updated = PostCounter.objects.filter(author_id=author_id).update(
+        posts_count=F('posts_count') + delta)
+    if updated or delta < 0:
+        # Отсутствующий счётчик при удалении не создаём: автор может
+        # удаляться вместе с постами, расхождения исправит recount_posts.
+        return
+    # Счётчика ещё нет - считаем точно, новые посты уже в базе.
+    PostCounter.objects.get_or_create(
+        author_id=author_id,
+        defaults={
+            'posts_count': Post.objects.filter(author_id=author_id).count(),
+        },
+    )
+
+
+def change_post_counts(deltas):
+    """Сдвинуть счётчики пачкой: deltas - словарь {author_id: delta}."""
+    for author_id, delta in deltas.items():
+        if delta:
+            change_post_count(author_id, delta)
+
+
+@transaction.atomic
+def recount_post_counters(batch_size=RECOUNT_BATCH_SIZE):
+    """Пересчитать все счётчики с нуля, вернуть число авторов."""
+    PostCounter.objects.all().delete()
+    counts = (
+        Post.objects.order_by()
+        .values_list('author_id')
+        .annotate(posts_count=Count('id'))
+    )
+    batch = []
+    total = 0
+    for author_id, posts_count in counts.iterator():
+        batch.append(
+            PostCounter(author_id=author_id, posts_count=posts_count))
+        if len(batch) >= batch_size:
+            PostCounter.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    PostCounter.objects.bulk_create(batch)
+    return total + len(batch)
@@ -0,0 +1,61 @@
+import csv
+import json
+
+from .models import Post
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = ('id', 'text', 'pub_date', 'author__username', 'group__slug')
+EXPORT_COLUMNS = ('id', 'text', 'pub_date', 'author', 'group')
+FORMATS = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class Echo:
+    """Буфер для csv.writer, который просто возвращает строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(post_list, chunk_size=EXPORT_CHUNK_SIZE):
+    """Кортежи колонок выгрузки без создания объектов Post.
+
+    iterator() не кэширует queryset и читает строки пачками, поэтому
+    память не зависит от числа постов.
+    """
+    return (
+        post_list.order_by('pub_date', 'id')
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def render_ndjson(rows):
+    for row in rows:
+        record = dict(zip(EXPORT_COLUMNS, row))
+        record['pub_date'] = record['pub_date'].isoformat()
+        yield json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def render_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row_id, text, pub_date, author, group in rows:
+        yield writer.writerow(
+            (row_id, text, pub_date.isoformat(), author, group or ''))
+
+
+RENDERERS = {
+    'ndjson': render_ndjson,
+    'csv': render_csv,
+}
+
+
+def export_posts(post_list=None, file_format='ndjson',
+                 chunk_size=EXPORT_CHUNK_SIZE):
+    """Генератор строк выгрузки в формате ndjson или csv."""
+    if post_list is None:
+        post_list = Post.objects.all()
+    return RENDERERS[file_format](export_rows(post_list, chunk_size))
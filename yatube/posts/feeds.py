@@ -0,0 +1,124 @@
+from django.contrib.syndication.views import Feed
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from .cache import (INDEX_SCOPE, cache_page_for_anonymous, group_scope,
+                    profile_scope, versioned_listing)
+from .models import Group, Post, User
+
+FEED_ITEMS = 20
+FEED_TITLE_WORDS = 10
+
+
+class PostFeed(Feed):
+    """Общая часть лент: последние FEED_ITEMS постов."""
+
+    def feed_posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        return self.feed_posts(obj).select_related(
+            'author', 'group')[:FEED_ITEMS]
+
+    def item_title(self, item):
+        return Truncator(item.text).words(FEED_TITLE_WORDS)
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+
+class IndexFeed(PostFeed):
+    title = 'Yatube: последние обновления'
+    description = 'Новые посты всех авторов'
+
+    def link(self):
+        return reverse('posts:index')
+
+
+class GroupFeed(PostFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def feed_posts(self, obj):
+        return Post.objects.filter(group_id=obj.pk)
+
+    def title(self, obj):
+        return f'Yatube: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('posts:group_posts', args=[obj.slug])
+
+
+class ProfileFeed(PostFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def feed_posts(self, obj):
+        return Post.objects.filter(author_id=obj.pk)
+
+    def title(self, obj):
+        return f'Yatube: {obj.get_full_name() or obj.username}'
+
+    def description(self, obj):
+        return f'Посты пользователя {obj.username}'
+
+    def link(self, obj):
+        return reverse('posts:profile', args=[obj.username])
+
+
+class IndexAtomFeed(IndexFeed):
+    feed_type = Atom1Feed
+    subtitle = IndexFeed.description
+
+
+class GroupAtomFeed(GroupFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class ProfileAtomFeed(ProfileFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+def cached_feed(feed_class, scope_func):
+    """View ленты, которая строится один раз на версию области кэша.
+
+    Повторные опросы читалки получают страницу из кэша или 304.
+    """
+    feed = feed_class()
+
+    def view(request, *args, **kwargs):
+        return feed(request, *args, **kwargs)
+    view.__name__ = feed_class.__name__
+    view = cache_page_for_anonymous(scope_func)(view)
+    return versioned_listing(scope_func)(view)
+
+
+index_rss = cached_feed(IndexFeed, lambda: INDEX_SCOPE)
+index_atom = cached_feed(IndexAtomFeed, lambda: INDEX_SCOPE)
+group_rss = cached_feed(GroupFeed, group_scope)
+group_atom = cached_feed(GroupAtomFeed, group_scope)
+profile_rss = cached_feed(ProfileFeed, profile_scope)
+profile_atom = cached_feed(ProfileAtomFeed, profile_scope)
@@ -1,12 +1,145 @@
+import time
+from itertools import islice
+
 from django import forms
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.forms.utils import flatatt
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
 
-from posts.models import Post
+from posts.cache import GROUPS_SCOPE, get_scope_version
+from posts.models import Group, Post
 
 User = get_user_model()
 
+GROUP_AUTOCOMPLETE_LIMIT = 20
+# Сколько секунд процесс верит своему списку групп без общего кэша.
+GROUP_CHOICES_TIMEOUT = 60
+
+# Версия области GROUPS_SCOPE -> GroupChoices, общий для процесса.
+_group_choices = {}
+
+
+class GroupChoices:
+    """Группы для выбора: пары (pk, название) и готовые <option>."""
+
+    def __init__(self, choices):
+        self.loaded = time.monotonic()
+        self.choices = choices
+        self.labels = {str(pk): title for pk, title in choices}
+        self.options = format_html_join(
+            '', '<option value="{}">{}</option>', choices)
+
+
+def group_choices():
+    """Группы для выбора, общие для всех форм процесса.
+
+    Таблица перечитывается, когда сигналы Group сменили версию области
+    GROUPS_SCOPE. С общим кэшем (SHARED_CACHE) смену версии видят все
+    процессы; с кэшем в памяти - только процесс, изменивший группу,
+    поэтому остальные перечитывают список раз в GROUP_CHOICES_TIMEOUT.
+    """
+    version = get_scope_version(GROUPS_SCOPE)
+    cached = _group_choices.get(version)
+    if cached is None or (
+            not settings.SHARED_CACHE
+            and time.monotonic() - cached.loaded > GROUP_CHOICES_TIMEOUT):
+        cached = GroupChoices(tuple(
+            Group.objects.order_by('title', 'pk').values_list('pk', 'title')
+        ))
+        _group_choices.clear()
+        _group_choices[version] = cached
+    return cached
+
+
+def search_groups(query, limit=GROUP_AUTOCOMPLETE_LIMIT):
+    """Первые limit групп, в названии которых есть query."""
+    query = query.strip().casefold()
+    return list(islice(
+        ((pk, title) for pk, title in group_choices().choices
+         if query in title.casefold()),
+        limit))
+
+
+class GroupSelect(forms.Select):
+    """Select групп, собранный из <option> кэша процесса.
+
+    Список поля (ModelChoiceField.choices) не читается: это был бы
+    запрос ко всей таблице на каждый показ формы.
+    """
+
+    def __init__(self, attrs=None, empty_label='---------'):
+        super().__init__(attrs)
+        self.empty_label = empty_label
+
+    def render_options(self, value):
+        cached = group_choices()
+        if value in cached.labels:
+            option = format_html('<option value="{}">', value)
+            return mark_safe(cached.options.replace(
+                option, option[:-1] + ' selected>', 1))
+        return cached.options
+
+    def render(self, name, value, attrs=None, renderer=None):
+        value = '' if value is None else str(value)
+        empty_option = '' if self.empty_label is None else format_html(
+            '<option value="">{}</option>', self.empty_label)
+        return format_html(
+            '<select name="{}"{}>{}{}</select>',
+            name, flatatt(self.build_attrs(self.attrs, attrs)),
+            empty_option, self.render_options(value))
+
+
+class GroupAutocomplete(GroupSelect):
+    """Поиск группы по названию для очень длинных списков.
+
+    В select попадает только выбранная группа, остальные варианты
+    скрипт подгружает из posts:group_autocomplete.
+    """
+
+    class Media:
+        js = ('js/group_autocomplete.js',)
+
+    def render_options(self, value):
+        label = group_choices().labels.get(value)
+        if label is None:
+            return ''
+        return format_html(
+            '<option value="{}" selected>{}</option>', value, label)
+
+    def render(self, name, value, attrs=None, renderer=None):
+        attrs = self.build_attrs(self.attrs, attrs)
+        search = format_html(
+            '<input type="search" class="form-control mb-2" '
+            'placeholder="Начните вводить название группы" '
+            'data-group-autocomplete="{}" aria-controls="{}">',
+            reverse('posts:group_autocomplete'), attrs.get('id', ''))
+        return search + super().render(name, value, attrs, renderer)
+
+
+def use_cached_group_choices(field, widget_class=None):
+    """Показывать ModelChoiceField групп из кэша процесса.
+
+    Проверка отправленного значения остаётся за ModelChoiceField: это
+    один запрос по первичному ключу. Без widget_class поиск вместо
+    списка включает настройка GROUP_AUTOCOMPLETE.
+    """
+    if widget_class is None:
+        widget_class = (GroupAutocomplete if settings.GROUP_AUTOCOMPLETE
+                        else GroupSelect)
+    widget = widget_class(field.widget.attrs, empty_label=field.empty_label)
+    widget.is_required = field.required
+    field.widget = widget
+    return field
+
 
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         fields = ('text', 'group',)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        use_cached_group_choices(self.fields['group'])
@@ -0,0 +1,74 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from posts.benchmark import compare, default_targets, run
+
+ITERATIONS = 50
+TOLERANCE = 0.2
+
+
+class Command(BaseCommand):
+    help = ('Замерить view posts через тестовый клиент: медиана и p99 '
+            'времени ответа, число SQL-запросов и размер ответа.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=ITERATIONS)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--host', default='localhost',
+                            help='Host запросов, должен быть в '
+                                 'ALLOWED_HOSTS.')
+        parser.add_argument('--only', nargs='*', default=(),
+                            help='Замерить только эти цели.')
+        parser.add_argument(
+            '--session-mode', choices=settings.SESSION_ENGINES,
+            help='Хранилище сессий на время замера, см. SESSION_MODE.')
+        parser.add_argument('--output', help='Сохранить отчёт в JSON.')
+        parser.add_argument('--baseline',
+                            help='Сравнить с сохранённым отчётом.')
+        parser.add_argument(
+            '--tolerance', type=float, default=TOLERANCE,
+            help='Допустимое ухудшение времени, доля от базового.')
+
+    def handle(self, *args, **options):
+        targets = default_targets()
+        if not targets:
+            raise CommandError(
+                'В базе нет постов: сначала запустите seed_posts.')
+        if options['only']:
+            targets = [target for target in targets
+                       if target.name in options['only']]
+        session_mode = options['session_mode'] or settings.SESSION_MODE
+        with override_settings(
+                SESSION_ENGINE=settings.SESSION_ENGINES[session_mode]):
+            report = run(targets, options['iterations'],
+                         warmup=options['warmup'], host=options['host'])
+        report['session_mode'] = session_mode
+        self.print_report(report)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+        if options['baseline']:
+            with open(options['baseline']) as baseline:
+                regressions = compare(report, json.load(baseline),
+                                      options['tolerance'])
+            if regressions:
+                raise CommandError(
+                    'Регрессии:\n' + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS('Регрессий нет'))
+
+    def print_report(self, report):
+        self.stdout.write(
+            f'Постов: {report["posts"]}, '
+            f'итераций: {report["iterations"]}, '
+            f'сессии: {report["session_mode"]}')
+        self.stdout.write(
+            f'{"view":<28}{"status":>7}{"median ms":>11}{"p99 ms":>10}'
+            f'{"req/s":>9}{"queries":>9}{"bytes":>9}')
+        for name, result in report['results'].items():
+            self.stdout.write(
+                f'{name:<28}{result["status"]:>7}{result["median_ms"]:>11}'
+                f'{result["p99_ms"]:>10}{result["requests_per_second"]:>9}'
+                f'{result["queries"]:>9}{result["bytes"]:>9}')
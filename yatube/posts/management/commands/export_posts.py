@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.export import EXPORT_CHUNK_SIZE, FORMATS, export_posts
+from posts.models import Group, Post, User
+
+
+class Command(BaseCommand):
+    help = ('Потоково выгрузить посты группы или автора в NDJSON или CSV. '
+            'Формат совместим с import_posts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--group', help='Slug группы.')
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument('--format', choices=FORMATS, default='ndjson')
+        parser.add_argument('--output',
+                            help='Файл для выгрузки, по умолчанию stdout.')
+        parser.add_argument('--chunk-size', type=int,
+                            default=EXPORT_CHUNK_SIZE,
+                            help='Сколько строк читать из базы за раз.')
+
+    def handle(self, *args, **options):
+        post_list = Post.objects.all()
+        if options['group']:
+            group = Group.objects.filter(slug=options['group']).first()
+            if group is None:
+                raise CommandError(f'Группа {options["group"]} не найдена')
+            post_list = post_list.filter(group_id=group.pk)
+        if options['author']:
+            author = User.objects.filter(username=options['author']).first()
+            if author is None:
+                raise CommandError(f'Автор {options["author"]} не найден')
+            post_list = post_list.filter(author_id=author.pk)
+        lines = export_posts(post_list, options['format'],
+                             options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as output:
+            output.writelines(lines)
@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+import time
+from collections import Counter
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.bulk import explicit_pub_date, invalidate_after_bulk_insert
+from posts.counters import change_post_counts
+from posts.models import Group, ImportCheckpoint, Post, User
+from posts.search import index_posts
+
+CHUNK_SIZE = 10000
+INSERT_BATCH_SIZE = 1000
+FORMATS = ('jsonl', 'csv')
+
+
+def read_records(path, file_format):
+    """Потоково читать записи: в памяти всегда одна строка файла.
+
+    Строки JSONL отдаются как есть: их разбирает parse_records внутри
+    пачки, чтобы ошибка в JSON сообщала номера записей, как и прочие.
+    """
+    with open(path, encoding='utf-8', newline='') as source:
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            if line.strip():
+                yield line
+
+
+def parse_records(chunk, file_format):
+    if file_format == 'csv':
+        return chunk
+    return [json.loads(line) for line in chunk]
+
+
+class Command(BaseCommand):
+    help = ('Потоково импортировать посты из JSONL или CSV с полями '
+            'text, author, group, pub_date. Прерванный импорт '
+            'продолжается с последней сохранённой пачки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS,
+                            help='По умолчанию - по расширению файла.')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Записей в одной транзакции.')
+        parser.add_argument('--batch-size', type=int,
+                            default=INSERT_BATCH_SIZE,
+                            help='Записей в одном INSERT.')
+        parser.add_argument('--source',
+                            help='Имя контрольной точки, по умолчанию '
+                                 'абсолютный путь к файлу.')
+        parser.add_argument('--restart', action='store_true',
+                            help='Начать сначала, забыв контрольную точку.')
+        parser.add_argument('--no-search-index', action='store_true',
+                            help='Не индексировать посты для поиска.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'Файл {path} не найден')
+        file_format = options['format'] or (
+            'csv' if path.endswith('.csv') else 'jsonl')
+        source = options['source'] or os.path.abspath(path)
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(source=source)
+        if options['restart']:
+            checkpoint.lines_done = 0
+            checkpoint.save()
+        skipped = checkpoint.lines_done
+        if skipped:
+            self.stdout.write(f'Продолжаем после записи {skipped}')
+
+        self.authors = dict(User.objects.values_list('username', 'id'))
+        self.groups = dict(Group.objects.values_list('slug', 'id'))
+        self.touched_authors = set()
+        self.touched_groups = set()
+        self.options = options
+
+        records = islice(read_records(path, file_format), skipped, None)
+        imported = 0
+        started = time.monotonic()
+        with explicit_pub_date():
+            while True:
+                chunk = list(islice(records, options['chunk_size']))
+                if not chunk:
+                    break
+                try:
+                    self.import_chunk(
+                        checkpoint, parse_records(chunk, file_format))
+                except (KeyError, TypeError, ValueError) as error:
+                    raise CommandError(
+                        f'Ошибка в записях {skipped + imported + 1}-'
+                        f'{skipped + imported + len(chunk)}: {error!r}. '
+                        f'Импорт можно продолжить после исправления.')
+                imported += len(chunk)
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f'Импортировано {skipped + imported} '
+                    f'({imported / elapsed:.0f} постов/с)')
+
+        invalidate_after_bulk_insert(
+            [Group(pk=pk, slug=slug) for slug, pk in self.groups.items()
+             if pk in self.touched_groups],
+            [User(pk=pk, username=username)
+             for username, pk in self.authors.items()
+             if pk in self.touched_authors],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: импортировано {imported} постов'))
+
+    def resolve(self, chunk):
+        """Дополнить таблицы авторов и групп недостающими записями."""
+        usernames = {record['author'] for record in chunk} - set(self.authors)
+        if usernames:
+            password = make_password(None)
+            User.objects.bulk_create(
+                [User(username=name, password=password)
+                 for name in usernames],
+                batch_size=self.options['batch_size'])
+            self.authors.update(User.objects.filter(
+                username__in=usernames).values_list('username', 'id'))
+        slugs = {
+            record['group'] for record in chunk if record.get('group')
+        } - set(self.groups)
+        if slugs:
+            Group.objects.bulk_create(
+                [Group(slug=slug, title=slug, description='')
+                 for slug in slugs],
+                batch_size=self.options['batch_size'])
+            self.groups.update(Group.objects.filter(
+                slug__in=slugs).values_list('slug', 'id'))
+
+    def build_post(self, record):
+        pub_date = timezone.now()
+        if record.get('pub_date'):
+            pub_date = parse_datetime(record['pub_date'])
+            if pub_date is None:
+                raise ValueError(f'Неверная дата {record["pub_date"]}')
+            if timezone.is_naive(pub_date):
+                pub_date = timezone.make_aware(pub_date)
+        return Post(
+            text=record['text'],
+            author_id=self.authors[record['author']],
+            group_id=self.groups[record['group']]
+            if record.get('group') else None,
+            pub_date=pub_date,
+        )
+
+    @transaction.atomic
+    def import_chunk(self, checkpoint, chunk):
+        # Сначала пишем контрольную точку: транзакция берёт блокировку
+        # записи, и новые id постов идут подряд после max_id.
+        ImportCheckpoint.objects.filter(pk=checkpoint.pk).update(
+            lines_done=F('lines_done') + len(chunk))
+        self.resolve(chunk)
+        posts = [self.build_post(record) for record in chunk]
+        max_id = Post.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        Post.objects.bulk_create(posts, batch_size=self.options['batch_size'])
+        change_post_counts(Counter(post.author_id for post in posts))
+        self.touched_authors.update(post.author_id for post in posts)
+        self.touched_groups.update(
+            post.group_id for post in posts if post.group_id)
+        if not self.options['no_search_index']:
+            index_posts(
+                Post.objects.filter(id__gt=max_id).only('id', 'text'))
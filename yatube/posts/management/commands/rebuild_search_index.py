@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import REINDEX_BATCH_SIZE, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Построить поисковый индекс постов заново.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=REINDEX_BATCH_SIZE,
+            help='Сколько постов индексировать за одну транзакцию.',
+        )
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано постов: {indexed}'))
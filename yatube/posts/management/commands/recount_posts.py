@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import RECOUNT_BATCH_SIZE, recount_post_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчитать счётчики постов авторов с нуля.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=RECOUNT_BATCH_SIZE,
+            help='Сколько счётчиков вставлять за один INSERT.',
+        )
+
+    def handle(self, *args, **options):
+        authors = recount_post_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Счётчики пересчитаны для авторов: {authors}'))
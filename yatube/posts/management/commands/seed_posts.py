@@ -0,0 +1,99 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+from mixer.backend.django import mixer
+
+from posts.bulk import explicit_pub_date, invalidate_after_bulk_insert
+from posts.counters import recount_post_counters
+from posts.models import Group, Post, User
+from posts.search import rebuild_index
+
+SIZES = {
+    'small': 1_000,
+    'medium': 100_000,
+    'large': 1_000_000,
+}
+BATCH_SIZE = 5000
+POSTS_PER_AUTHOR = 100
+POSTS_PER_GROUP = 500
+HISTORY_DAYS = 3 * 365
+
+
+class Command(BaseCommand):
+    help = 'Заполнить базу правдоподобными постами для бенчмарков.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size', choices=SIZES, default='small',
+            help='Готовый объём: ' + ', '.join(
+                f'{name}={count}' for name, count in SIZES.items()),
+        )
+        parser.add_argument(
+            '--posts', type=int,
+            help='Точное число постов, важнее --size.',
+        )
+        parser.add_argument('--authors', type=int,
+                            help='Число авторов, по умолчанию posts/100.')
+        parser.add_argument('--groups', type=int,
+                            help='Число групп, по умолчанию posts/500.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Зерно генераторов для повторяемости.')
+        parser.add_argument('--search-index', action='store_true',
+                            help='Перестроить поисковый индекс.')
+
+    def handle(self, *args, **options):
+        total = options['posts'] or SIZES[options['size']]
+        authors_count = options['authors'] or max(
+            1, total // POSTS_PER_AUTHOR)
+        groups_count = options['groups'] or max(1, total // POSTS_PER_GROUP)
+        random.seed(options['seed'])
+        fake = Faker('ru_RU')
+        fake.seed_instance(options['seed'])
+
+        run = timezone.now().strftime('%Y%m%d%H%M%S')
+        authors = mixer.cycle(authors_count).blend(
+            User,
+            username=mixer.sequence(f'bench_{run}_{{0}}'),
+            first_name=fake.first_name,
+            last_name=fake.last_name,
+        )
+        groups = mixer.cycle(groups_count).blend(
+            Group,
+            slug=mixer.sequence(f'bench-{run}-{{0}}'),
+            title=fake.sentence,
+            description=fake.text,
+        )
+        self.stdout.write(
+            f'Создано авторов: {len(authors)}, групп: {len(groups)}')
+
+        now = timezone.now()
+        created = 0
+        with explicit_pub_date():
+            while created < total:
+                size = min(options['batch_size'], total - created)
+                batch = [
+                    Post(
+                        text=fake.paragraph(nb_sentences=random.randint(1, 8)),
+                        author=random.choice(authors),
+                        group=random.choice(groups)
+                        if random.random() < 0.7 else None,
+                        pub_date=now - timedelta(
+                            seconds=random.randint(0, HISTORY_DAYS * 86400)),
+                    )
+                    for _ in range(size)
+                ]
+                with transaction.atomic():
+                    Post.objects.bulk_create(batch)
+                created += size
+                self.stdout.write(f'Постов: {created}/{total}')
+
+        recount_post_counters()
+        if options['search_index']:
+            rebuild_index()
+        invalidate_after_bulk_insert(groups, authors)
+        self.stdout.write(self.style.SUCCESS(f'Готово: {created} постов'))
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+from posts.search import REINDEX_BATCH_SIZE, build_terms
+
+
+def index_existing_posts(apps, schema_editor):
+    """Проиндексировать посты, созданные до появления поиска."""
+    Post = apps.get_model('posts', 'Post')
+    SearchTerm = apps.get_model('posts', 'SearchTerm')
+    last_id = 0
+    while True:
+        batch = list(
+            Post.objects.filter(id__gt=last_id, search_terms__isnull=True)
+            .order_by('id').only('id', 'text')[:REINDEX_BATCH_SIZE]
+        )
+        if not batch:
+            return
+        SearchTerm.objects.bulk_create(
+            [term for post in batch for term in build_terms(post, SearchTerm)],
+            batch_size=REINDEX_BATCH_SIZE,
+        )
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_existing_posts,
+                             migrations.RunPython.noop),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 from django.contrib.auth import get_user_model
 
@@ -29,6 +29,8 @@ class Post(models.Model):
     text = models.TextField(verbose_name='Текст поста')
     pub_date = models.DateTimeField(auto_now_add=True,
                                     verbose_name='Дата публикации')
+    updated_at = models.DateTimeField(auto_now=True,
+                                      verbose_name='Дата изменения')
     group = models.ForeignKey(
         Group,
         blank=True,
@@ -45,9 +47,153 @@ class Post(models.Model):
     )
 
     class Meta:
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
+        indexes = (
+            models.Index(fields=('pub_date', 'id'),
+                         name='post_pub_date_idx'),
+            models.Index(fields=('author', 'pub_date', 'id'),
+                         name='post_author_pub_date_idx'),
+            models.Index(fields=('group', 'pub_date', 'id'),
+                         name='post_group_pub_date_idx'),
+            # Время последней правки для ETag листингов, см.
+            # posts.cache.scope_validators.
+            models.Index(fields=('updated_at',),
+                         name='post_updated_at_idx'),
+        )
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
     def __str__(self):
         return self.text[:NUMBER_OF_POSTS]
+
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        # Сигналы (счётчик автора, индекс поиска, лента подписчиков)
+        # пишут в той же транзакции: ошибка в них откатывает и пост.
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Значения из базы нужны сигналам, чтобы заметить смену автора.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+
+class PostCounter(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_counter',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число постов'
+    )
+
+    class Meta:
+        verbose_name = 'Счётчик постов'
+        verbose_name_plural = 'Счётчики постов'
+
+    def __str__(self):
+        return f'{self.author_id}: {self.posts_count}'
+
+
+class SearchTerm(models.Model):
+    term = models.CharField(max_length=64, verbose_name='Терм')
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='search_terms',
+        verbose_name='Пост'
+    )
+    weight = models.FloatField(verbose_name='Вес терма')
+
+    class Meta:
+        unique_together = ('term', 'post')
+        verbose_name = 'Терм поиска'
+        verbose_name_plural = 'Термы поиска'
+
+    def __str__(self):
+        return self.term
+
+
+class ImportCheckpoint(models.Model):
+    source = models.CharField(max_length=255, unique=True,
+                              verbose_name='Источник')
+    lines_done = models.BigIntegerField(default=0,
+                                        verbose_name='Обработано строк')
+    updated_at = models.DateTimeField(auto_now=True,
+                                      verbose_name='Дата изменения')
+
+    class Meta:
+        verbose_name = 'Контрольная точка импорта'
+        verbose_name_plural = 'Контрольные точки импорта'
+
+    def __str__(self):
+        return f'{self.source}: {self.lines_done}'
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follower',
+        verbose_name='Подписчик'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='Автор'
+    )
+    fan_out_on_read = models.BooleanField(
+        default=False,
+        verbose_name='Посты подмешиваются при чтении',
+        help_text='У автора слишком много подписчиков для рассылки '
+                  'постов по лентам'
+    )
+
+    class Meta:
+        unique_together = ('user', 'author')
+        verbose_name = 'Подписка'
+        verbose_name_plural = 'Подписки'
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.author_id}'
+
+
+class TimelineEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        verbose_name='Владелец ленты'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        verbose_name='Пост'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор поста'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+
+    class Meta:
+        unique_together = ('user', 'post')
+        indexes = (
+            models.Index(fields=('user', 'pub_date', 'post'),
+                         name='timeline_user_pub_date_idx'),
+        )
+        verbose_name = 'Запись ленты'
+        verbose_name_plural = 'Записи ленты'
+
+    def __str__(self):
+        return f'{self.user_id}: {self.post_id}'
@@ -1,9 +1,190 @@
+import base64
+import binascii
+
 from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.dateparse import parse_datetime
 
 POSTS_ON_PAGE = 10
+PAGES_ON_EACH_SIDE = 2
+PAGES_ON_ENDS = 1
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+
+def encode_cursor(post, direction):
+    raw = f'{direction}|{post.pub_date.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Вернуть (направление, pub_date, id) или None для битого курсора."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        direction, pub_date, pk = raw.split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or pub_date is None:
+        return None
+    return direction, pub_date, pk
+
+
+class PostPaginator(Paginator):
+    """Paginator с подключаемым способом подсчёта записей.
+
+    count - готовое число или вызываемый объект без аргументов;
+    без него выполняется обычный SELECT COUNT(*).
+    """
+    ELLIPSIS = '…'
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count
+
+    @cached_property
+    def count(self):
+        if self.count_strategy is None:
+            return super().count
+        if callable(self.count_strategy):
+            return self.count_strategy()
+        return self.count_strategy
+
+    def get_elided_page_range(self, number=1, on_each_side=PAGES_ON_EACH_SIDE,
+                              on_ends=PAGES_ON_ENDS):
+        """Номера страниц вокруг текущей и по краям, пропуски - ELLIPSIS.
+
+        Длина диапазона не зависит от числа страниц.
+        """
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > on_each_side + on_ends + 2:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1,
+                             self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
+
+
+class KeysetPage:
+    """Страница курсорной пагинации по ключу (pub_date, id).
+
+    Не знает ни общего числа записей, ни своего номера: соседние
+    страницы доступны только через next_cursor и previous_cursor.
+    """
+    is_cursor = True
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self.next_cursor = (
+            encode_cursor(object_list[-1], CURSOR_NEXT)
+            if has_next and object_list else None
+        )
+        self.previous_cursor = (
+            encode_cursor(object_list[0], CURSOR_PREVIOUS)
+            if has_previous and object_list else None
+        )
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def cursor_queryset(post_list, cursor, id_field='id'):
+    """Вернуть queryset страницы без LIMIT и направление курсора.
+
+    Условие на ключ записано как pub_date <= x AND (pub_date < x OR
+    id < pk), чтобы у индекса по (pub_date, id) была граница диапазона.
+    id_field - поле с id поста, если в queryset не сами посты.
+    """
+    decoded = decode_cursor(cursor) if cursor else None
+    if decoded is None:
+        return post_list.order_by('-pub_date', f'-{id_field}'), None
+    direction, pub_date, pk = decoded
+    if direction == CURSOR_NEXT:
+        return post_list.filter(
+            Q(pub_date__lte=pub_date),
+            Q(pub_date__lt=pub_date) | Q(**{f'{id_field}__lt': pk}),
+        ).order_by('-pub_date', f'-{id_field}'), direction
+    return post_list.filter(
+        Q(pub_date__gte=pub_date),
+        Q(pub_date__gt=pub_date) | Q(**{f'{id_field}__gt': pk}),
+    ).order_by('pub_date', id_field), direction
+
+
+def keyset_page(fetch, cursor, posts_on_page=POSTS_ON_PAGE):
+    """Собрать KeysetPage из записей, которые вернул fetch.
+
+    fetch(cursor, limit) возвращает не больше limit записей с pub_date
+    и pk в порядке cursor_queryset и направление курсора.
+    """
+    posts, direction = fetch(cursor, posts_on_page + 1)
+    has_more = len(posts) > posts_on_page
+    posts = posts[:posts_on_page]
+    if direction is None:
+        return KeysetPage(posts, has_next=has_more, has_previous=False)
+    if direction == CURSOR_NEXT:
+        return KeysetPage(posts, has_next=has_more, has_previous=True)
+    if not has_more:
+        # Дошли до начала ленты: отдаём полную первую страницу.
+        return keyset_page(fetch, None, posts_on_page)
+    posts.reverse()
+    return KeysetPage(posts, has_next=True, has_previous=True)
+
+
+def paginate_by_cursor(post_list, cursor, posts_on_page=POSTS_ON_PAGE):
+    """Курсорная пагинация без COUNT(*) и OFFSET.
+
+    Записи упорядочены по (-pub_date, -id); каждая страница - это
+    один запрос с LIMIT posts_on_page + 1, лишняя запись лишь
+    показывает, есть ли что-то дальше.
+    """
+    def fetch(cursor, limit):
+        queryset, direction = cursor_queryset(post_list, cursor)
+        return list(queryset[:limit]), direction
+    return keyset_page(fetch, cursor, posts_on_page)
 
 
-def paginate(post_list, page_number, posts_on_page=POSTS_ON_PAGE):
-    paginator = Paginator(post_list, posts_on_page)
+def paginate(post_list, page_number, posts_on_page=POSTS_ON_PAGE,
+             cursor=None, count=None):
+    if cursor is not None:
+        return paginate_by_cursor(post_list, cursor, posts_on_page)
+    paginator = PostPaginator(post_list, posts_on_page, count=count)
     page_obj = paginator.get_page(page_number)
+    if hasattr(count, 'reset') and len(page_obj) < posts_on_page and (
+            page_obj.has_next() or page_obj.number > 1 and not page_obj):
+        # Неполная страница не в конце: приблизительный счётчик врёт.
+        count.reset()
+    page_obj.elided_page_range = list(
+        paginator.get_elided_page_range(page_obj.number))
     return page_obj
@@ -0,0 +1,118 @@
+import math
+import re
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, When
+
+from .counters import INDEX_COUNT_KEY, CachedCount
+from .models import Post, SearchTerm
+from .stemmer import stem
+
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 8
+REINDEX_BATCH_SIZE = 500
+
+WORD_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile(r'[а-я]')
+STOP_WORDS = frozenset((
+    'а', 'без', 'бы', 'в', 'во', 'вот', 'да', 'для', 'до', 'его', 'ее',
+    'если', 'же', 'за', 'и', 'из', 'или', 'им', 'их', 'к', 'как', 'ко',
+    'ли', 'мы', 'на', 'не', 'нет', 'ни', 'но', 'о', 'об', 'он', 'она',
+    'они', 'от', 'по', 'при', 'с', 'со', 'так', 'то', 'ты', 'у', 'уже',
+    'что', 'это', 'я',
+))
+
+
+def analyze(text):
+    """Разбить текст на термы: регистр, «ё» и словоформы сводятся."""
+    terms = []
+    for word in WORD_RE.findall(text.casefold().replace('ё', 'е')):
+        if word in STOP_WORDS:
+            continue
+        if CYRILLIC_RE.search(word):
+            word = stem(word)
+        terms.append(word[:MAX_TERM_LENGTH])
+    return terms
+
+
+def build_terms(post, model=SearchTerm):
+    """Термы поста с весом tf / sqrt(длина документа).
+
+    model - класс терма; миграции передают историческую модель.
+    """
+    terms = Counter(analyze(post.text))
+    norm = math.sqrt(sum(terms.values())) or 1
+    return [
+        model(post_id=post.pk, term=term, weight=count / norm)
+        for term, count in terms.items()
+    ]
+
+
+@transaction.atomic
+def index_post(post):
+    SearchTerm.objects.filter(post_id=post.pk).delete()
+    SearchTerm.objects.bulk_create(build_terms(post))
+
+
+@transaction.atomic
+def index_posts(posts):
+    """Переиндексировать пачку постов тремя запросами."""
+    posts = list(posts)
+    SearchTerm.objects.filter(
+        post_id__in=[post.pk for post in posts]).delete()
+    SearchTerm.objects.bulk_create(
+        [term for post in posts for term in build_terms(post)],
+        batch_size=REINDEX_BATCH_SIZE,
+    )
+
+
+def rebuild_index(batch_size=REINDEX_BATCH_SIZE):
+    """Построить индекс заново, вернуть число проиндексированных постов."""
+    SearchTerm.objects.all().delete()
+    indexed = 0
+    last_id = 0
+    while True:
+        batch = list(
+            Post.objects.filter(id__gt=last_id).order_by('id')
+            .only('id', 'text')[:batch_size]
+        )
+        if not batch:
+            return indexed
+        index_posts(batch)
+        indexed += len(batch)
+        last_id = batch[-1].id
+
+
+def search_posts(query):
+    """Ранжированные id постов, содержащих все термы запроса.
+
+    Возвращает queryset словарей {'post_id', 'score'}: его можно
+    пагинировать, а посты страницы загрузить отдельно.
+    """
+    terms = list(dict.fromkeys(analyze(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return SearchTerm.objects.none().values('post_id')
+    document_frequency = dict(
+        SearchTerm.objects.filter(term__in=terms).order_by()
+        .values_list('term').annotate(Count('id'))
+    )
+    if len(document_frequency) < len(terms):
+        return SearchTerm.objects.none().values('post_id')
+    total = CachedCount(INDEX_COUNT_KEY, Post.objects.all())()
+    score = Sum(
+        Case(
+            *(When(term=term,
+                   then=F('weight') * math.log(1 + total / frequency))
+              for term, frequency in document_frequency.items()),
+            output_field=FloatField(),
+        ),
+        output_field=FloatField(),
+    )
+    return (
+        SearchTerm.objects.filter(term__in=terms)
+        .values('post_id')
+        .annotate(matched=Count('id'), score=score)
+        .filter(matched=len(terms))
+        .order_by('-score', '-post_id')
+    )
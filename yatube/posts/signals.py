@@ -0,0 +1,132 @@
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .cache import (GROUPS_SCOPE, INDEX_SCOPE, group_scope, invalidate_scopes,
+                    profile_scope)
+from .counters import (INDEX_COUNT_KEY, change_cached_counts,
+                       change_post_count, group_count_key)
+from .models import Group, Post, TimelineEntry, User
+from .search import index_post
+from .timeline import fan_out
+
+
+def invalidate_post_pages(author_ids, group_ids):
+    """Сбросить кэш главной, страниц групп и профилей авторов."""
+    usernames = User.objects.filter(
+        pk__in=author_ids).values_list('username', flat=True)
+    slugs = Group.objects.filter(
+        pk__in=[pk for pk in group_ids if pk is not None],
+    ).values_list('slug', flat=True)
+    invalidate_scopes(
+        INDEX_SCOPE,
+        *(profile_scope(username) for username in usernames),
+        *(group_scope(slug) for slug in slugs),
+    )
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    loaded = getattr(instance, '_loaded_values', {})
+    old_author_id = loaded.get('author_id', instance.author_id)
+    old_group_id = loaded.get('group_id', instance.group_id)
+    if created:
+        change_post_count(instance.author_id, 1)
+        change_cached_counts({
+            INDEX_COUNT_KEY: 1,
+            group_count_key(instance.group_id): instance.group_id and 1,
+        })
+    else:
+        if old_author_id != instance.author_id:
+            change_post_count(old_author_id, -1)
+            change_post_count(instance.author_id, 1)
+            TimelineEntry.objects.filter(post=instance).delete()
+            fan_out(instance)
+        if old_group_id != instance.group_id:
+            change_cached_counts({
+                group_count_key(old_group_id): old_group_id and -1,
+                group_count_key(instance.group_id): instance.group_id and 1,
+            })
+    if created or loaded.get('text') != instance.text:
+        index_post(instance)
+    if created:
+        fan_out(instance)
+    invalidate_post_pages(
+        {old_author_id, instance.author_id},
+        {old_group_id, instance.group_id},
+    )
+    instance._loaded_values = dict(
+        loaded,
+        author_id=instance.author_id,
+        group_id=instance.group_id,
+        text=instance.text,
+    )
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    change_post_count(instance.author_id, -1)
+    change_cached_counts({
+        INDEX_COUNT_KEY: -1,
+        group_count_key(instance.group_id): instance.group_id and -1,
+    })
+    invalidate_post_pages({instance.author_id}, {instance.group_id})
+
+
+@receiver(pre_save, sender=Group)
+def group_saving(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    old = Group.objects.filter(pk=instance.pk).values_list(
+        'slug', 'title').first()
+    if old is None:
+        return
+    old_slug, old_title = old
+    # Страницу по старому адресу тоже нужно сбросить.
+    invalidate_scopes(group_scope(old_slug))
+    if (old_slug, old_title) != (instance.slug, instance.title):
+        # Ссылка на группу есть в карточках постов на главной и в
+        # профилях авторов.
+        author_ids = instance.posts.order_by().values_list(
+            'author_id', flat=True).distinct()
+        invalidate_post_pages(set(author_ids), {instance.pk})
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, **kwargs):
+    invalidate_scopes(group_scope(instance.slug))
+
+
+@receiver(pre_delete, sender=Group)
+def group_deleting(sender, instance, **kwargs):
+    # Посты группы останутся без неё, а ссылки на группу есть в карточках.
+    author_ids = instance.posts.order_by().values_list(
+        'author_id', flat=True).distinct()
+    invalidate_post_pages(set(author_ids), {instance.pk})
+
+
+@receiver(pre_save, sender=User)
+def author_saving(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or update_fields == frozenset({'last_login'}):
+        return
+    old_username = User.objects.filter(pk=instance.pk).values_list(
+        'username', flat=True).first()
+    if old_username not in (None, instance.username):
+        # Профиль по старому имени тоже нужно сбросить.
+        invalidate_scopes(profile_scope(old_username))
+
+
+@receiver(post_save, sender=User)
+def author_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    # Имя автора есть в карточках на главной и на страницах групп.
+    group_ids = instance.posts.order_by().values_list(
+        'group_id', flat=True).distinct()
+    invalidate_post_pages({instance.pk}, set(group_ids))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, **kwargs):
+    invalidate_scopes(GROUPS_SCOPE)
@@ -0,0 +1,114 @@
+"""Стеммер Портера (Snowball) для русского языка.
+
+Реализация алгоритма https://snowballstem.org/algorithms/russian/stemmer.html
+без внешних зависимостей. Слово ожидается в нижнем регистре и с «ё»,
+уже заменённой на «е».
+"""
+
+VOWELS = 'аеиоуыэюя'
+
+PERFECTIVE_GERUND_1 = ('в', 'вши', 'вшись')
+PERFECTIVE_GERUND_2 = ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись')
+ADJECTIVE = (
+    'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем', 'им',
+    'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю', 'ая',
+    'яя', 'ою', 'ею',
+)
+PARTICIPLE_1 = ('ем', 'нн', 'вш', 'ющ', 'щ')
+PARTICIPLE_2 = ('ивш', 'ывш', 'ующ')
+REFLEXIVE = ('ся', 'сь')
+VERB_1 = (
+    'ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет',
+    'ют', 'ны', 'ть', 'ешь', 'нно',
+)
+VERB_2 = (
+    'ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй',
+    'ил', 'ыл', 'им', 'ым', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют',
+    'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю',
+)
+NOUN = (
+    'а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и',
+    'ией', 'ей', 'ой', 'ий', 'й', 'иям', 'ям', 'ием', 'ем', 'ам', 'ом', 'о',
+    'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я',
+)
+SUPERLATIVE = ('ейш', 'ейше')
+DERIVATIONAL = ('ост', 'ость')
+
+
+def _regions(word):
+    """Вернуть начала областей RV и R2."""
+    rv = r1 = r2 = len(word)
+    for i, char in enumerate(word):
+        if char in VOWELS:
+            rv = i + 1
+            break
+    for i in range(1, len(word)):
+        if word[i] not in VOWELS and word[i - 1] in VOWELS:
+            r1 = i + 1
+            break
+    for i in range(r1 + 1, len(word)):
+        if word[i] not in VOWELS and word[i - 1] in VOWELS:
+            r2 = i + 1
+            break
+    return rv, r2
+
+
+def _remove_ending(word, start, endings, after_a_endings=()):
+    """Отрезать самое длинное окончание, целиком лежащее после start.
+
+    Окончания из after_a_endings допустимы только после «а» или «я»,
+    которые остаются в слове. Возвращает None, если отрезать нечего.
+    """
+    matches = [
+        ending for ending in endings + after_a_endings
+        if word.endswith(ending) and len(word) - len(ending) >= start
+    ]
+    if not matches:
+        return None
+    ending = max(matches, key=len)
+    stem = word[:-len(ending)]
+    if ending in after_a_endings and ending not in endings:
+        if len(stem) - 1 < start or stem[-1] not in 'ая':
+            return None
+    return stem
+
+
+def _remove_adjectival(word, rv):
+    stem = _remove_ending(word, rv, ADJECTIVE)
+    if stem is None:
+        return None
+    without_participle = _remove_ending(
+        stem, rv, PARTICIPLE_2, PARTICIPLE_1)
+    return stem if without_participle is None else without_participle
+
+
+def stem(word):
+    rv, r2 = _regions(word)
+    if rv >= len(word):
+        return word
+
+    stemmed = _remove_ending(
+        word, rv, PERFECTIVE_GERUND_2, PERFECTIVE_GERUND_1)
+    if stemmed is None:
+        word = _remove_ending(word, rv, REFLEXIVE) or word
+        stemmed = (
+            _remove_adjectival(word, rv)
+            or _remove_ending(word, rv, VERB_2, VERB_1)
+            or _remove_ending(word, rv, NOUN)
+        )
+    word = stemmed if stemmed is not None else word
+
+    if word.endswith('и') and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    stemmed = _remove_ending(word, r2, DERIVATIONAL)
+    word = stemmed if stemmed is not None else word
+
+    stemmed = _remove_ending(word, rv, SUPERLATIVE)
+    if stemmed is not None:
+        word = stemmed
+    if word.endswith('нн') and len(word) - 2 >= rv:
+        word = word[:-1]
+    elif stemmed is None and word.endswith('ь') and len(word) - 1 >= rv:
+        word = word[:-1]
+    return word
@@ -0,0 +1,125 @@
+import calendar
+import datetime
+
+from django import template
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+from django.utils import formats, timezone
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+
+register = template.Library()
+
+
+def local_date(value):
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+def date_bounds(queryset, field_name):
+    """Первая и последняя дата: два ORDER BY ... LIMIT 1 по индексу.
+
+    Один aggregate(Min, Max) SQLite считает полным проходом.
+    """
+    values = queryset.values_list(field_name, flat=True)
+    first = values.order_by(field_name).first()
+    if first is None:
+        return None, None
+    last = values.order_by(f'-{field_name}').first()
+    return local_date(first), local_date(last)
+
+
+def indexed_date_hierarchy(cl):
+    """date_hierarchy админки без SELECT DISTINCT по всей таблице.
+
+    Стандартный тег строит ссылки из queryset.dates(), а это
+    django_date_trunc для каждой строки. Здесь годы, месяцы и дни
+    берутся из диапазона между первой и последней датой текущего
+    уровня, поэтому пустой месяц внутри диапазона тоже получит ссылку.
+    """
+    field_name = cl.date_hierarchy
+    year_field = f'{field_name}__year'
+    month_field = f'{field_name}__month'
+    day_field = f'{field_name}__day'
+    year_lookup = cl.params.get(year_field)
+    month_lookup = cl.params.get(month_field)
+    day_lookup = cl.params.get(day_field)
+
+    def link(filters):
+        return cl.get_query_string(filters, [f'{field_name}__'])
+
+    if year_lookup and month_lookup and day_lookup:
+        day = datetime.date(
+            int(year_lookup), int(month_lookup), int(day_lookup))
+        return {
+            'show': True,
+            'back': {
+                'link': link({year_field: year_lookup,
+                              month_field: month_lookup}),
+                'title': capfirst(
+                    formats.date_format(day, 'YEAR_MONTH_FORMAT')),
+            },
+            'choices': [{'title': capfirst(
+                formats.date_format(day, 'MONTH_DAY_FORMAT'))}],
+        }
+    first, last = date_bounds(cl.queryset, field_name)
+    if first is None:
+        return {'show': True, 'back': None, 'choices': []}
+    if not (year_lookup or month_lookup) and first.year == last.year:
+        year_lookup = first.year
+        if first.month == last.month:
+            month_lookup = first.month
+    if year_lookup and month_lookup:
+        year, month = int(year_lookup), int(month_lookup)
+        days = [
+            datetime.date(year, month, number)
+            for number in range(1, calendar.monthrange(year, month)[1] + 1)
+            if first <= datetime.date(year, month, number) <= last
+        ]
+        return {
+            'show': True,
+            'back': {'link': link({year_field: year_lookup}),
+                     'title': str(year_lookup)},
+            'choices': [{
+                'link': link({year_field: year_lookup,
+                              month_field: month_lookup,
+                              day_field: day.day}),
+                'title': capfirst(
+                    formats.date_format(day, 'MONTH_DAY_FORMAT')),
+            } for day in days],
+        }
+    if year_lookup:
+        year = int(year_lookup)
+        months = [
+            datetime.date(year, month, 1) for month in range(1, 13)
+            if (first.year, first.month) <= (year, month)
+            <= (last.year, last.month)
+        ]
+        return {
+            'show': True,
+            'back': {'link': link({}), 'title': _('All dates')},
+            'choices': [{
+                'link': link({year_field: year_lookup,
+                              month_field: month.month}),
+                'title': capfirst(
+                    formats.date_format(month, 'YEAR_MONTH_FORMAT')),
+            } for month in months],
+        }
+    return {
+        'show': True,
+        'back': None,
+        'choices': [{
+            'link': link({year_field: str(year)}),
+            'title': str(year),
+        } for year in range(first.year, last.year + 1)],
+    }
+
+
+@register.tag(name='indexed_date_hierarchy')
+def indexed_date_hierarchy_tag(parser, token):
+    return InclusionAdminNode(
+        parser, token,
+        func=indexed_date_hierarchy,
+        template_name='date_hierarchy.html',
+        takes_context=False,
+    )
@@ -0,0 +1,122 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..counters import recount_post_counters
+from ..models import Group, Post, User
+
+
+@override_settings(SHARED_CACHE=True)
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password')
+        Group.objects.bulk_create([
+            Group(title=f'Группа {i}', slug=f'admin-{i}',
+                  description='Описание')
+            for i in range(5)
+        ])
+        cls.groups = list(Group.objects.all())
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:posts_post_changelist')
+
+    def create_posts(self, number):
+        prefix = f'admin_author_{Post.objects.count()}_'
+        User.objects.bulk_create([
+            User(username=f'{prefix}{i}') for i in range(number)
+        ])
+        authors = User.objects.filter(username__startswith=prefix)
+        Post.objects.bulk_create([
+            Post(text=f'Пост {i}', author=author,
+                 group=self.groups[i % len(self.groups)])
+            for i, author in enumerate(authors)
+        ])
+        # bulk_create обходит сигналы, как и импорт, после которого
+        # счётчики авторов пересчитываются.
+        recount_post_counters()
+
+    def changelist_queries(self, **params):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in captured.captured_queries]
+
+    def test_queries_do_not_depend_on_rows(self):
+        """Число запросов списка не растёт с числом строк и групп."""
+        self.create_posts(3)
+        self.changelist_queries()
+        few = self.changelist_queries()
+        self.create_posts(30)
+        many = self.changelist_queries()
+        self.assertEqual(len(few), len(many))
+
+    def test_unfiltered_list_skips_count(self):
+        """Без фильтра число постов берётся из кэша счётчика."""
+        self.create_posts(3)
+        self.changelist_queries()
+        queries = self.changelist_queries()
+        self.assertFalse([sql for sql in queries if 'COUNT(' in sql])
+
+    @override_settings(SHARED_CACHE=False)
+    def test_unfiltered_total_from_post_counters(self):
+        """Общее число постов берётся из счётчиков авторов."""
+        self.create_posts(3)
+        queries = self.changelist_queries()
+        self.assertFalse([sql for sql in queries if 'COUNT(' in sql])
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+    def test_filtered_count_is_limited(self):
+        """Под фильтром COUNT ограничен LIMIT-ом."""
+        self.create_posts(3)
+        queries = self.changelist_queries(q='Пост')
+        counts = [sql for sql in queries if 'COUNT(' in sql]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('LIMIT', counts[0])
+
+    def test_date_hierarchy_and_author_autocomplete(self):
+        """Навигация по датам и автокомплит автора подключены."""
+        self.create_posts(1)
+        post = Post.objects.get()
+        response = self.client.get(
+            self.url, {'pub_date__year': post.pub_date.year})
+        self.assertContains(response, 'Пост 0')
+        response = self.client.get(
+            reverse('admin:posts_post_change', args=[post.pk]))
+        self.assertContains(response,
+                            reverse('admin:auth_user_autocomplete'))
+
+    def test_date_hierarchy_avoids_full_scan(self):
+        """Ссылки по датам строятся без DISTINCT по всей таблице."""
+        self.create_posts(3)
+        first, second, third = Post.objects.order_by('pk')
+        Post.objects.filter(pk=first.pk).update(
+            pub_date=second.pub_date.replace(year=2020, month=3, day=5))
+        Post.objects.filter(pk=third.pk).update(
+            pub_date=second.pub_date.replace(year=2020, month=5, day=7))
+        levels = {
+            'years': {},
+            'months': {'pub_date__year': 2020},
+            'days': {'pub_date__year': 2020, 'pub_date__month': 3},
+        }
+        expected = {
+            'years': f'pub_date__year={second.pub_date.year}',
+            'months': 'pub_date__month=4',
+            'days': 'pub_date__day=5',
+        }
+        for level, params in levels.items():
+            with self.subTest(level=level):
+                queries = self.changelist_queries(**params)
+                self.assertFalse(
+                    [sql for sql in queries
+                     if 'django_date_trunc' in sql or 'DISTINCT' in sql])
+                response = self.client.get(self.url, params)
+                self.assertContains(response, expected[level])
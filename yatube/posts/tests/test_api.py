@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post, User
+from ..paginator import POSTS_ON_PAGE
+
+POSTS_TOTAL = POSTS_ON_PAGE + 3
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='api_author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='api-group', description='Описание')
+        Post.objects.bulk_create([
+            Post(text=f'Пост {i}', author=cls.author,
+                 group=cls.group if i % 2 else None)
+            for i in range(POSTS_TOTAL)
+        ])
+        cls.post = Post.objects.filter(group=cls.group).first()
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_list_pages_with_cursor(self):
+        """Список отдаётся страницами, next ведёт на следующую."""
+        response = self.client.get(reverse('posts:api_posts'))
+        data = response.json()
+        self.assertEqual(len(data['results']), POSTS_ON_PAGE)
+        self.assertIsNone(data['previous'])
+        data = self.client.get(data['next']).json()
+        self.assertEqual(len(data['results']), POSTS_TOTAL - POSTS_ON_PAGE)
+        self.assertIsNone(data['next'])
+        self.assertIsNotNone(data['previous'])
+
+    def test_sparse_fields(self):
+        """fields= ограничивает поля ответа и загружаемые колонки."""
+        # COUNT(*) и MAX(updated_at) для ETag + страница постов.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('posts:api_posts'),
+                                       {'fields': 'group', 'limit': 3})
+        results = response.json()['results']
+        self.assertEqual(len(results), 3)
+        self.assertEqual(set(results[0]), {'id', 'pub_date', 'group'})
+
+    def test_filtered_lists(self):
+        """Листинги группы и автора содержат только их посты."""
+        group_data = self.client.get(reverse(
+            'posts:api_group_posts', args=[self.group.slug]),
+            {'limit': 100}).json()
+        self.assertEqual({post['group'] for post in group_data['results']},
+                         {self.group.slug})
+        self.assertEqual(len(group_data['results']), POSTS_TOTAL // 2)
+        author_data = self.client.get(reverse(
+            'posts:api_author_posts', args=[self.author.username]),
+            {'limit': 100}).json()
+        self.assertEqual(len(author_data['results']), POSTS_TOTAL)
+
+    def test_post_detail(self):
+        """Пост отдаётся со всеми полями."""
+        data = self.client.get(
+            reverse('posts:api_post_detail', args=[self.post.pk])).json()
+        self.assertEqual(data['text'], self.post.text)
+        self.assertEqual(data['author'], self.author.username)
+        self.assertEqual(data['group'], self.group.slug)
+
+    def test_errors(self):
+        """Ошибки отдаются в JSON с подходящим статусом."""
+        cases = (
+            (reverse('posts:api_posts'), {'fields': 'password'}, 400),
+            (reverse('posts:api_posts'), {'limit': 1000}, 400),
+            (reverse('posts:api_group_posts', args=['missing']), {}, 404),
+            (reverse('posts:api_post_detail', args=[0]), {}, 404),
+        )
+        for url, params, status in cases:
+            with self.subTest(url=url, params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status)
+                self.assertIn('detail', response.json())
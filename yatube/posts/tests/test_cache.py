@@ -0,0 +1,288 @@
+import warnings
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..cache import get_scope_version, group_scope, invalidate_scopes
+from ..models import Group, Post, User
+
+
+@override_settings(SHARED_CACHE=True)
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='cache_author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='cache-group', description='Описание')
+        cls.other_group = Group.objects.create(
+            title='Другая группа', slug='cache-other',
+            description='Описание')
+        cls.post = Post.objects.create(
+            text='Старый текст', author=cls.author, group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.urls = {
+            'index': reverse('posts:index'),
+            'group': reverse('posts:group_posts', args=[self.group.slug]),
+            'other_group': reverse('posts:group_posts',
+                                   args=[self.other_group.slug]),
+            'profile': reverse('posts:profile',
+                               args=[self.author.username]),
+        }
+
+    def warm_up(self):
+        for url in self.urls.values():
+            self.guest_client.get(url)
+
+    def test_anonymous_page_served_from_cache(self):
+        """Повторный анонимный запрос не ходит в базу."""
+        self.guest_client.get(self.urls['index'])
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(self.urls['index'])
+        self.assertContains(response, self.post.text)
+
+    def test_group_slug_change_invalidates_listings(self):
+        """Смена адреса группы сбрасывает главную и профиль автора."""
+        self.warm_up()
+        etag = self.guest_client.get(self.urls['index'])['ETag']
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'cache-group-renamed'
+        group.save()
+        new_link = reverse('posts:group_posts', args=[group.slug])
+        for name in ('index', 'profile'):
+            with self.subTest(page=name):
+                response = self.guest_client.get(self.urls[name])
+                self.assertContains(response, new_link)
+        self.assertNotEqual(
+            self.guest_client.get(self.urls['index'])['ETag'], etag)
+
+    def test_author_rename_invalidates_old_profile(self):
+        """После смены имени профиль по старому имени не отдаётся."""
+        self.warm_up()
+        author = User.objects.get(pk=self.author.pk)
+        author.username = 'cache_author_renamed'
+        author.save()
+        response = self.guest_client.get(self.urls['profile'])
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_authorized_page_not_cached(self):
+        """Страницы для авторизованных не кэшируются."""
+        client = Client()
+        client.force_login(self.author)
+        client.get(self.urls['index'])
+        Post.objects.bulk_create([
+            Post(text='Пост без сигналов', author=self.author)])
+        self.assertContains(client.get(self.urls['index']),
+                            'Пост без сигналов')
+
+    def test_page_number_is_part_of_key(self):
+        """Разные страницы пагинатора кэшируются отдельно."""
+        self.guest_client.get(self.urls['index'])
+        with self.assertNumQueries(1):
+            self.guest_client.get(self.urls['index'] + '?cursor=')
+
+    def test_new_post_invalidates_affected_pages(self):
+        """Новый пост сбрасывает главную, группу и профиль автора."""
+        self.warm_up()
+        Post.objects.create(
+            text='Свежий пост', author=self.author, group=self.group)
+        for name in ('index', 'group', 'profile'):
+            with self.subTest(page=name):
+                self.assertContains(
+                    self.guest_client.get(self.urls[name]), 'Свежий пост')
+        with self.assertNumQueries(0):
+            self.guest_client.get(self.urls['other_group'])
+
+    def test_group_change_invalidates_old_and_new_group(self):
+        """Перенос поста сбрасывает старую и новую группу."""
+        self.warm_up()
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = self.other_group
+        post.save()
+        self.assertNotContains(
+            self.guest_client.get(self.urls['group']), post.text)
+        self.assertContains(
+            self.guest_client.get(self.urls['other_group']), post.text)
+
+    def test_delete_invalidates_affected_pages(self):
+        """Удаление поста сбрасывает главную, группу и профиль."""
+        post = Post.objects.create(
+            text='Удаляемый пост', author=self.author, group=self.group)
+        self.warm_up()
+        post.delete()
+        for name in ('index', 'group', 'profile'):
+            with self.subTest(page=name):
+                self.assertNotContains(
+                    self.guest_client.get(self.urls[name]), post.text)
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='card_author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='card-group', description='Описание')
+        cls.post = Post.objects.create(
+            text='Исходный текст', author=cls.author, group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def test_card_reused_between_pages(self):
+        """Карточка с главной переиспользуется в профиле."""
+        self.authorized_client.get(reverse('posts:index'))
+        Post.objects.filter(pk=self.post.pk).update(text='Тихая правка')
+        response = self.authorized_client.get(
+            reverse('posts:profile', args=[self.author.username]))
+        self.assertContains(response, 'Исходный текст')
+
+    def test_edit_refreshes_card(self):
+        """Редактирование поста меняет версию карточки."""
+        self.authorized_client.get(reverse('posts:index'))
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=[self.post.pk]),
+            data={'text': 'Новый текст', 'group': self.group.pk})
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Новый текст')
+        self.assertNotContains(response, 'Исходный текст')
+
+    def test_group_slug_change_refreshes_card(self):
+        """Смена адреса группы обновляет ссылки в карточках."""
+        self.authorized_client.get(reverse('posts:index'))
+        self.group.slug = 'card-group-renamed'
+        self.group.save()
+        response = self.authorized_client.get(reverse('posts:index'))
+        self.assertContains(
+            response, reverse('posts:group_posts', args=[self.group.slug]))
+
+    def test_author_rename_refreshes_card(self):
+        """Смена имени автора обновляет его карточки."""
+        self.authorized_client.get(reverse('posts:index'))
+        author = User.objects.get(pk=self.author.pk)
+        author.first_name = 'Новое'
+        author.last_name = 'Имя'
+        author.save()
+        self.assertContains(
+            self.authorized_client.get(reverse('posts:index')), 'Новое Имя')
+
+    def test_rename_keeps_post_updated_at(self):
+        """Смена имени автора и адреса группы не трогает updated_at."""
+        updated_at = Post.objects.get(pk=self.post.pk).updated_at
+        author = User.objects.get(pk=self.author.pk)
+        author.first_name = 'Другое'
+        author.save()
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'card-group-moved'
+        group.save()
+        self.assertEqual(
+            Post.objects.get(pk=self.post.pk).updated_at, updated_at)
+
+
+@override_settings(SHARED_CACHE=True)
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='etag_author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='etag-group', description='Описание')
+        cls.post = Post.objects.create(
+            text='Текст', author=cls.author, group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_posts', args=[self.group.slug]),
+            reverse('posts:profile', args=[self.author.username]),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        )
+
+    def test_matching_etag_returns_not_modified(self):
+        """Совпавший ETag даёт 304 без рендеринга шаблона."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code,
+                                 HTTPStatus.NOT_MODIFIED)
+                self.assertEqual(response.templates, [])
+
+    def test_etag_changes_with_content(self):
+        """Правка поста меняет ETag листингов и страницы поста."""
+        etags = [self.guest_client.get(url)['ETag'] for url in self.urls]
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Новый текст'
+        post.save()
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_etag_depends_on_user(self):
+        """Анонимный ETag не подходит авторизованному пользователю."""
+        client = Client()
+        client.force_login(self.author)
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+
+@override_settings(SHARED_CACHE=False)
+class ProcessLocalCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='local_author')
+        Post.objects.create(text='Первый пост', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_not_cached_without_shared_cache(self):
+        """С кэшем в памяти процесса страницы не кэшируются."""
+        client = Client()
+        client.get(reverse('posts:index'))
+        # Запись в обход сигналов - как запись в другом процессе.
+        Post.objects.bulk_create([
+            Post(text='Пост другого воркера', author=self.author)])
+        self.assertContains(client.get(reverse('posts:index')),
+                            'Пост другого воркера')
+
+    def test_etag_from_database_without_shared_cache(self):
+        """ETag строится по базе и видит записи других процессов."""
+        client = Client()
+        url = reverse('posts:profile', args=[self.author.username])
+        etag = client.get(url)['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        Post.objects.bulk_create([
+            Post(text='Пост другого воркера', author=self.author)])
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, 'Пост другого воркера')
+
+
+class ScopeVersionTests(TestCase):
+    def test_scope_key_safe_for_memcached(self):
+        """Слаг не в ASCII не попадает в ключ кэша как есть."""
+        scope = group_scope('Тестовый слаг')
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            version = get_scope_version(scope)
+            invalidate_scopes(scope)
+            self.assertNotEqual(get_scope_version(scope), version)
@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from ..models import (Group, ImportCheckpoint, Post, PostCounter,
+                      SearchTerm)
+
+SEED_POSTS = 40
+
+
+class BenchmarkCommandsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_seed_and_benchmark(self):
+        """seed_posts наполняет базу, benchmark_views пишет отчёт."""
+        call_command('seed_posts', posts=SEED_POSTS, authors=3, groups=2,
+                     batch_size=15, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), SEED_POSTS)
+        self.assertEqual(Group.objects.count(), 2)
+        self.assertEqual(
+            sum(PostCounter.objects.values_list('posts_count', flat=True)),
+            SEED_POSTS)
+
+        report_path = os.path.join(self.tmpdir.name, 'report.json')
+        call_command('benchmark_views', iterations=2, warmup=0,
+                     host='testserver', output=report_path,
+                     stdout=StringIO())
+        with open(report_path) as report_file:
+            report = json.load(report_file)
+        self.assertEqual(report['posts'], SEED_POSTS)
+        for name, result in report['results'].items():
+            with self.subTest(target=name):
+                self.assertIn(result['status'], (200, 302))
+                self.assertGreater(result['median_ms'], 0)
+        self.assertEqual(Post.objects.count(), SEED_POSTS)
+
+        call_command('benchmark_views', iterations=2, warmup=0,
+                     host='testserver', only=['index:authorized'],
+                     session_mode='signed_cookies', output=report_path,
+                     stdout=StringIO())
+        with open(report_path) as report_file:
+            report = json.load(report_file)
+        self.assertEqual(report['session_mode'], 'signed_cookies')
+        self.assertEqual(report['results']['index:authorized']['status'],
+                         200)
+
+
+class ImportPostsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write(self, name, lines):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as source:
+            source.write('\n'.join(lines) + '\n')
+        return path
+
+    def test_import_jsonl(self):
+        """JSONL импортируется с авторами, группами, счётчиками и датами."""
+        path = self.write('posts.jsonl', [
+            json.dumps({'text': f'Импортированный пост {i}',
+                        'author': f'author{i % 2}',
+                        'group': 'imported' if i % 3 else '',
+                        'pub_date': f'2020-01-{i + 1:02d}T10:00:00'})
+            for i in range(7)
+        ])
+        call_command('import_posts', path, chunk_size=3, batch_size=2,
+                     stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 7)
+        self.assertEqual(Group.objects.get().posts.count(), 4)
+        self.assertEqual(
+            dict(PostCounter.objects.values_list(
+                'author__username', 'posts_count')),
+            {'author0': 4, 'author1': 3})
+        self.assertEqual(
+            Post.objects.order_by('pub_date').first().pub_date.day, 1)
+        self.assertTrue(SearchTerm.objects.filter(term='пост').exists())
+
+    def test_import_resumes_after_failure(self):
+        """После ошибки импорт продолжается с последней целой пачки."""
+        lines = ['text,author,group,pub_date'] + [
+            f'Пост {i},author,,' for i in range(5)
+        ] + ['Плохой пост,author,,не дата']
+        path = self.write('posts.csv', lines)
+        with self.assertRaises(CommandError):
+            call_command('import_posts', path, chunk_size=2,
+                         stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 4)
+        self.assertEqual(ImportCheckpoint.objects.get().lines_done, 4)
+
+        lines[-1] = 'Исправленный пост,author,,2020-01-01 10:00'
+        self.write('posts.csv', lines)
+        call_command('import_posts', path, chunk_size=2, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 6)
+        self.assertEqual(
+            PostCounter.objects.get(author__username='author').posts_count,
+            6)
+
+    def test_malformed_json_is_resumable(self):
+        """Битая строка JSONL останавливает импорт с номерами записей."""
+        lines = [
+            json.dumps({'text': f'Пост {i}', 'author': 'author'})
+            for i in range(3)
+        ] + ['{"text": "Оборванная строка"']
+        path = self.write('posts.jsonl', lines)
+        with self.assertRaisesMessage(CommandError, 'Ошибка в записях 3-4'):
+            call_command('import_posts', path, chunk_size=2,
+                         stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(ImportCheckpoint.objects.get().lines_done, 2)
+
+        lines[-1] = json.dumps({'text': 'Пост 3', 'author': 'author'})
+        self.write('posts.jsonl', lines)
+        call_command('import_posts', path, chunk_size=2, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 4)
@@ -0,0 +1,95 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Post, PostCounter, User
+
+POSTS_TO_CREATE = 3
+
+
+def posts_count(author):
+    return PostCounter.objects.get(author=author).posts_count
+
+
+class PostCounterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='counter_author')
+        cls.other_author = User.objects.create_user(username='other_author')
+        cls.admin = User.objects.create_superuser(
+            username='counter_admin', email='admin@example.com',
+            password='password')
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+
+    def create_posts(self, count=POSTS_TO_CREATE):
+        return [
+            Post.objects.create(text=f'Пост {i}', author=self.author)
+            for i in range(count)
+        ]
+
+    def test_counter_grows_on_create(self):
+        """Создание поста через форму увеличивает счётчик."""
+        self.create_posts()
+        self.authorized_client.post(reverse('posts:post_create'),
+                                    data={'text': 'Пост из формы'})
+        self.assertEqual(posts_count(self.author), POSTS_TO_CREATE + 1)
+
+    def test_counter_shrinks_on_bulk_delete(self):
+        """Удаление постов queryset-ом уменьшает счётчик."""
+        posts = self.create_posts()
+        Post.objects.filter(pk__in=[post.pk for post in posts[1:]]).delete()
+        self.assertEqual(posts_count(self.author), 1)
+
+    def test_counter_shrinks_on_admin_delete(self):
+        """Массовое удаление в админке уменьшает счётчик."""
+        posts = self.create_posts()
+        admin_client = Client()
+        admin_client.force_login(self.admin)
+        admin_client.post(reverse('admin:posts_post_changelist'), {
+            'action': 'delete_selected',
+            'post': 'yes',
+            '_selected_action': [post.pk for post in posts[:2]],
+        })
+        self.assertEqual(posts_count(self.author), 1)
+
+    def test_counter_follows_author_change(self):
+        """Смена автора поста переносит его в чужой счётчик."""
+        post = self.create_posts()[0]
+        post = Post.objects.get(pk=post.pk)
+        post.author = self.other_author
+        post.save()
+        self.assertEqual(posts_count(self.author), POSTS_TO_CREATE - 1)
+        self.assertEqual(posts_count(self.other_author), 1)
+
+    def test_failed_counter_update_rolls_back_post(self):
+        """Ошибка в обновлении счётчика откатывает и сам пост."""
+        self.create_posts()
+        with mock.patch('posts.signals.change_post_count',
+                        side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                Post.objects.create(text='Лишний пост', author=self.author)
+        self.assertEqual(Post.objects.filter(author=self.author).count(),
+                         POSTS_TO_CREATE)
+        self.assertEqual(posts_count(self.author), POSTS_TO_CREATE)
+
+    def test_recount_command_fixes_drift(self):
+        """Команда recount_posts исправляет рассинхронизацию."""
+        self.create_posts()
+        PostCounter.objects.filter(author=self.author).update(posts_count=42)
+        call_command('recount_posts', stdout=StringIO())
+        self.assertEqual(posts_count(self.author), POSTS_TO_CREATE)
+
+    def test_profile_shows_counter(self):
+        """Профиль показывает значение счётчика."""
+        self.create_posts()
+        response = self.authorized_client.get(
+            reverse('posts:profile', args=[self.author.username]))
+        self.assertContains(response, f'Всего постов: {POSTS_TO_CREATE}')
@@ -0,0 +1,76 @@
+import csv
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post, User
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='export_author')
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        cls.group = Group.objects.create(
+            title='Группа', slug='export', description='Описание')
+        cls.posts = [
+            Post.objects.create(text=f'Пост, "{i}"', author=cls.author,
+                                group=cls.group if i % 2 else None)
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def test_export_requires_staff(self):
+        """Выгрузка доступна только персоналу."""
+        client = Client()
+        client.force_login(self.author)
+        response = client.get(
+            reverse('posts:profile_export', args=[self.author.username]))
+        self.assertEqual(response.status_code, 302)
+
+    def test_profile_export_ndjson(self):
+        """NDJSON выгрузка автора отдаётся потоком одним запросом к постам."""
+        response = self.staff_client.get(
+            reverse('posts:profile_export', args=[self.author.username]))
+        self.assertTrue(response.streaming)
+        with CaptureQueriesContext(connection) as captured:
+            lines = b''.join(response.streaming_content).decode()
+        self.assertEqual(len(captured), 1)
+        records = [json.loads(line) for line in lines.splitlines()]
+        self.assertEqual([record['id'] for record in records],
+                         [post.id for post in self.posts])
+        self.assertEqual(records[1]['group'], self.group.slug)
+        self.assertEqual(records[0]['author'], self.author.username)
+
+    def test_group_export_csv(self):
+        """CSV выгрузка группы содержит только её посты."""
+        response = self.staff_client.get(
+            reverse('posts:group_export', args=[self.group.slug]),
+            {'format': 'csv'})
+        rows = list(csv.DictReader(StringIO(
+            b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['text'] for row in rows],
+                         ['Пост, "1"', 'Пост, "3"'])
+
+    def test_unknown_format(self):
+        """Неизвестный формат - ошибка 400."""
+        response = self.staff_client.get(
+            reverse('posts:group_export', args=[self.group.slug]),
+            {'format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_command(self):
+        """export_posts пишет в stdout выгрузку автора."""
+        output = StringIO()
+        call_command('export_posts', author=self.author.username,
+                     stdout=output)
+        self.assertEqual(len(output.getvalue().splitlines()), 5)
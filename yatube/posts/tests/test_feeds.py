@@ -0,0 +1,70 @@
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..feeds import FEED_ITEMS
+from ..models import Group, Post, User
+
+ATOM_ENTRY = '{http://www.w3.org/2005/Atom}entry'
+
+
+@override_settings(SHARED_CACHE=True)
+class FeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='feed_author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='feed-group', description='Описание')
+        Post.objects.bulk_create([
+            Post(text=f'Пост номер {i}', author=cls.author,
+                 group=cls.group if i % 2 else None)
+            for i in range(FEED_ITEMS + 5)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_feeds_list_posts(self):
+        """Ленты RSS и Atom отдают последние посты своей области."""
+        cases = (
+            ('posts:index_rss', [], 'item', FEED_ITEMS),
+            ('posts:index_atom', [], ATOM_ENTRY, FEED_ITEMS),
+            ('posts:group_rss', [self.group.slug], 'item',
+             (FEED_ITEMS + 5) // 2),
+            ('posts:profile_atom', [self.author.username], ATOM_ENTRY,
+             FEED_ITEMS),
+        )
+        for name, args, tag, expected in cases:
+            with self.subTest(feed=name):
+                response = self.client.get(reverse(name, args=args))
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                root = ElementTree.fromstring(response.content)
+                self.assertEqual(len(root.findall(f'.//{tag}')), expected)
+
+    def test_missing_group_feed(self):
+        """Лента несуществующей группы - 404."""
+        response = self.client.get(reverse('posts:group_rss',
+                                           args=['missing']))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_feed_cached_until_new_post(self):
+        """Повторный опрос без запросов к базе, новый пост сбрасывает кэш."""
+        url = reverse('posts:group_atom', args=[self.group.slug])
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).content, first.content)
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+        Post.objects.create(text='Свежий пост', author=self.author,
+                            group=self.group)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn('Свежий пост', response.content.decode())
@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Post, TimelineEntry, User
+from ..paginator import POSTS_ON_PAGE
+from ..timeline import timeline_page
+
+
+class FollowTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='followed')
+        cls.stranger = User.objects.create_user(username='stranger')
+        cls.old_post = Post.objects.create(text='Старый пост',
+                                           author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def follow(self, author):
+        return self.client.get(
+            reverse('posts:profile_follow', args=[author.username]))
+
+    def feed(self):
+        return list(self.client.get(
+            reverse('posts:follow_index')).context['page_obj'])
+
+    def test_follow_and_unfollow(self):
+        """Подписка добавляет посты автора в ленту, отписка убирает."""
+        self.follow(self.author)
+        self.assertTrue(Follow.objects.filter(
+            user=self.reader, author=self.author).exists())
+        self.assertEqual(self.feed(), [self.old_post])
+
+        self.client.get(
+            reverse('posts:profile_unfollow', args=[self.author.username]))
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(self.feed(), [])
+
+    def test_cannot_follow_self(self):
+        """На себя подписаться нельзя."""
+        self.follow(self.reader)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_new_post_fanned_out_to_followers(self):
+        """Новый пост попадает в ленты подписчиков, но не остальных."""
+        self.follow(self.author)
+        post = Post.objects.create(text='Новый пост', author=self.author)
+        self.assertEqual(self.feed(), [post, self.old_post])
+        self.assertFalse(
+            TimelineEntry.objects.filter(user=self.stranger).exists())
+
+    def test_profile_shows_follow_state(self):
+        """Кнопка в профиле меняется после подписки."""
+        url = reverse('posts:profile', args=[self.author.username])
+        self.assertFalse(self.client.get(url).context['following'])
+        self.follow(self.author)
+        self.assertTrue(self.client.get(url).context['following'])
+
+    def test_prolific_author_read_on_demand(self):
+        """Посты автора с толпой подписчиков подмешиваются при чтении."""
+        Follow.objects.create(user=self.stranger, author=self.author)
+        with mock.patch('posts.timeline.FANOUT_MAX_FOLLOWERS', 1):
+            self.follow(self.author)
+            self.assertTrue(Follow.objects.filter(
+                author=self.author, fan_out_on_read=True).exists())
+            post = Post.objects.create(text='Пост звезды', author=self.author)
+        self.assertFalse(
+            TimelineEntry.objects.filter(post=post).exists())
+        self.assertEqual(self.feed(), [post, self.old_post])
+        self.assertEqual(
+            timeline_page(self.stranger).object_list, [post, self.old_post])
+
+    def test_feed_keyset_pages(self):
+        """Лента листается курсором без пропусков и повторов."""
+        self.follow(self.author)
+        other = User.objects.create_user(username='other')
+        Follow.objects.create(user=self.reader, author=other,
+                              fan_out_on_read=True)
+        for i in range(POSTS_ON_PAGE + 2):
+            Post.objects.create(text=f'Пост {i}',
+                                author=other if i % 2 else self.author)
+        expected = list(Post.objects.filter(
+            author__in=[self.author, other]))
+        page = timeline_page(self.reader)
+        seen = list(page)
+        while page.has_next():
+            page = timeline_page(self.reader, page.next_cursor)
+            seen += list(page)
+        self.assertEqual(seen, expected)
+        previous = timeline_page(self.reader, page.previous_cursor)
+        self.assertEqual(list(previous), expected[:POSTS_ON_PAGE])
@@ -1,8 +1,14 @@
+import time
 from http import HTTPStatus
+from unittest import mock
 
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from ..forms import GROUP_CHOICES_TIMEOUT, PostForm
 from ..models import Group, Post, User
 
 
@@ -181,3 +187,100 @@ class PostFormTests(TestCase):
         self.assertEqual(post.text, form_data['text'])
         self.assertEqual(post.author, self.post_author)
         self.assertEqual(post.group, None)
+
+
+class GroupChoicesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='group_chooser')
+        cls.group = Group.objects.create(
+            title='Кошки', slug='cats', description='Описание')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:post_create')
+
+    def group_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url)
+        return response, [query['sql'] for query in captured.captured_queries
+                          if 'posts_group' in query['sql']]
+
+    def test_choices_cached_between_renders(self):
+        """Повторный показ формы не читает таблицу групп."""
+        response, queries = self.group_queries()
+        self.assertContains(
+            response, f'<option value="{self.group.pk}">Кошки</option>',
+            html=True)
+        self.assertEqual(len(queries), 1)
+        _, queries = self.group_queries()
+        self.assertEqual(queries, [])
+
+    def test_group_save_and_delete_reset_choices(self):
+        """Создание и удаление группы сбрасывают кэш списка."""
+        self.group_queries()
+        group = Group.objects.create(
+            title='Собаки', slug='dogs', description='Описание')
+        response, _ = self.group_queries()
+        self.assertContains(response, 'Собаки')
+        group.delete()
+        response, _ = self.group_queries()
+        self.assertNotContains(response, 'Собаки')
+
+    @override_settings(SHARED_CACHE=False)
+    def test_choices_expire_without_shared_cache(self):
+        """Без общего кэша список групп живёт GROUP_CHOICES_TIMEOUT."""
+        self.group_queries()
+        # bulk_create обходит сигналы, как запись в другом процессе.
+        Group.objects.bulk_create([
+            Group(title='Собаки', slug='dogs', description='Описание')])
+        response, _ = self.group_queries()
+        self.assertNotContains(response, 'Собаки')
+        later = time.monotonic() + GROUP_CHOICES_TIMEOUT + 1
+        with mock.patch('posts.forms.time.monotonic', return_value=later):
+            response, _ = self.group_queries()
+        self.assertContains(response, 'Собаки')
+
+    def test_selected_group_marked_on_edit(self):
+        """В форме редактирования выбрана группа поста."""
+        post = Post.objects.create(
+            text='Пост', author=self.user, group=self.group)
+        response = self.client.get(
+            reverse('posts:post_edit', args=[post.pk]))
+        self.assertContains(
+            response,
+            f'<option value="{self.group.pk}" selected>Кошки</option>',
+            html=True)
+
+    def test_submit_checks_single_group(self):
+        """При отправке проверяется только выбранная группа."""
+        with CaptureQueriesContext(connection) as captured:
+            form = PostForm({'text': 'Пост', 'group': self.group.pk})
+            self.assertTrue(form.is_valid())
+        # Поле и проверка внешнего ключа модели ищут группу по pk.
+        self.assertTrue(captured.captured_queries)
+        for query in captured.captured_queries:
+            self.assertIn(f'"posts_group"."id" = {self.group.pk}',
+                          query['sql'])
+        form = PostForm({'text': 'Пост', 'group': 10 ** 6})
+        self.assertIn('group', form.errors)
+
+    @override_settings(GROUP_AUTOCOMPLETE=True)
+    def test_autocomplete(self):
+        """Вместо списка - поиск, варианты отдаёт group_autocomplete."""
+        Group.objects.create(
+            title='Кошачьи', slug='felines', description='Описание')
+        Group.objects.create(
+            title='Собаки', slug='dogs', description='Описание')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'data-group-autocomplete')
+        self.assertContains(response, 'js/group_autocomplete.js')
+        self.assertNotContains(response, 'Собаки')
+        response = self.client.get(
+            reverse('posts:group_autocomplete'), {'q': 'коша'})
+        self.assertEqual(
+            [result['text'] for result in response.json()['results']],
+            ['Кошачьи'])
@@ -0,0 +1,113 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..counters import INDEX_COUNT_KEY, CachedCount, group_count_key
+from ..models import Group, Post, User
+from ..paginator import POSTS_ON_PAGE, PostPaginator
+
+ELLIPSIS = PostPaginator.ELLIPSIS
+
+
+class ElidedPageRangeTests(TestCase):
+    def page_range(self, pages, number):
+        paginator = PostPaginator(range(pages * POSTS_ON_PAGE), POSTS_ON_PAGE)
+        return list(paginator.get_elided_page_range(number))
+
+    def test_short_listing_shows_all_pages(self):
+        """Для нескольких страниц выводятся все номера."""
+        self.assertEqual(self.page_range(5, 3), [1, 2, 3, 4, 5])
+
+    def test_window_around_current_page(self):
+        """Вокруг текущей страницы окно, края через многоточие."""
+        self.assertEqual(
+            self.page_range(50000, 25000),
+            [1, ELLIPSIS, 24998, 24999, 25000, 25001, 25002, ELLIPSIS,
+             50000])
+
+    def test_window_at_edges(self):
+        """У краёв диапазон не выходит за границы."""
+        self.assertEqual(self.page_range(50000, 1),
+                         [1, 2, 3, ELLIPSIS, 50000])
+        self.assertEqual(self.page_range(50000, 50000),
+                         [1, ELLIPSIS, 49998, 49999, 50000])
+
+
+class PaginatorTemplateTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='window_author')
+        Post.objects.bulk_create([
+            Post(text=f'Пост {i}', author=cls.user)
+            for i in range(POSTS_ON_PAGE * 30)
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_page_links_are_windowed(self):
+        """Шаблон выводит только окно номеров страниц."""
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(reverse('posts:index') + '?page=15')
+        self.assertContains(response, '?page=14"')
+        self.assertContains(response, '?page=30"')
+        self.assertNotContains(response, '?page=5"')
+        self.assertContains(response, ELLIPSIS, count=2)
+
+
+@override_settings(SHARED_CACHE=True)
+class CountStrategyTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='count_author')
+        cls.group = Group.objects.create(
+            title='Группа', slug='count-group', description='Описание')
+        for i in range(POSTS_ON_PAGE + 1):
+            Post.objects.create(text=f'Пост {i}', author=cls.user,
+                                group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_cached_count_skips_count_query(self):
+        """Повторный листинг не выполняет SELECT COUNT(*)."""
+        self.client.get(reverse('posts:index'))
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(reverse('posts:index'))
+        self.assertFalse(any('COUNT(' in query['sql']
+                             for query in captured.captured_queries))
+
+    @override_settings(SHARED_CACHE=False)
+    def test_count_cached_in_process_without_shared_cache(self):
+        """Без общего кэша счётчик тоже не считается на каждый запрос."""
+        self.client.get(reverse('posts:index'))
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(reverse('posts:index'))
+        self.assertFalse(any('COUNT(' in query['sql']
+                             for query in captured.captured_queries))
+
+    def test_cached_count_follows_create_and_delete(self):
+        """Счётчик группы сдвигается при создании и удалении."""
+        count = CachedCount(group_count_key(self.group.pk),
+                            self.group.posts.all())
+        self.assertEqual(count(), POSTS_ON_PAGE + 1)
+        post = Post.objects.create(text='Ещё пост', author=self.user,
+                                   group=self.group)
+        self.assertEqual(count(), POSTS_ON_PAGE + 2)
+        post.delete()
+        self.assertEqual(count(), POSTS_ON_PAGE + 1)
+
+    def test_stale_count_is_reset_by_short_page(self):
+        """Неполная страница сбрасывает завышенный счётчик."""
+        cache.set(INDEX_COUNT_KEY, POSTS_ON_PAGE * 5)
+        response = self.client.get(reverse('posts:index') + '?page=2')
+        self.assertEqual(response.context['page_obj'].paginator.num_pages, 5)
+        response = self.client.get(reverse('posts:index') + '?page=2')
+        self.assertEqual(response.context['page_obj'].paginator.num_pages, 2)
@@ -0,0 +1,117 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Group, Post, User
+from ..paginator import POSTS_ON_PAGE
+from .utils import QueryBudgetMixin
+
+# Бюджеты SQL-запросов на один запрос к странице. Они не зависят
+# от числа постов на странице: авторы и группы подтягиваются JOIN-ом.
+# Для авторизованного пользователя к бюджету добавляются
+# AUTH_QUERIES - чтение сессии и пользователя.
+AUTH_QUERIES = 2
+QUERY_BUDGETS = {
+    # Без общего кэша ETag листинга строится по базе
+    # (posts.cache.scope_validators): MAX(updated_at), а у группы и
+    # профиля ещё их шапка.
+    # COUNT(*) при промахе кэша счётчика + MAX + страница постов.
+    'posts:index': 3,
+    # Группа для ETag + COUNT(*) при промахе кэша счётчика + MAX +
+    # группа + страница постов.
+    'posts:group_posts': 5,
+    # Автор для ETag + MAX + автор со счётчиком постов + страница
+    # постов; в чужом профиле ещё проверка подписки.
+    'posts:profile': 4,
+    # Валидаторы для ETag + пост с автором, счётчиком постов и группой.
+    'posts:post_detail': 2,
+    # Подписки с рассылкой при чтении + ключи ленты + ключи постов
+    # таких авторов + посты страницы.
+    'posts:follow_index': 4,
+    # Список групп для формы при промахе кэша групп процесса.
+    'posts:post_create': 1,
+    # Пост + список групп при промахе кэша.
+    'posts:post_edit': 2,
+}
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='budget_author')
+        authors = User.objects.bulk_create([
+            User(username=f'budget_{i}') for i in range(POSTS_ON_PAGE)
+        ])
+        Group.objects.bulk_create([
+            Group(title=f'Группа {i}', slug=f'budget-{i}',
+                  description='Описание')
+            for i in range(POSTS_ON_PAGE)
+        ])
+        cls.group = Group.objects.get(slug='budget-0')
+        authors = list(User.objects.filter(username__startswith='budget_'))
+        groups = list(Group.objects.filter(slug__startswith='budget-'))
+        Post.objects.bulk_create([
+            Post(text=f'Пост {i}', author=authors[i % len(authors)],
+                 group=groups[i % len(groups)])
+            for i in range(POSTS_ON_PAGE * 2)
+        ])
+        Post.objects.bulk_create([
+            Post(text=f'Пост группы {i}', author=authors[i], group=cls.group)
+            for i in range(POSTS_ON_PAGE)
+        ])
+        cls.post = Post.objects.create(text='Свой пост', author=cls.user)
+        Post.objects.bulk_create([
+            Post(text=f'Пост автора {i}', author=cls.user, group=groups[i])
+            for i in range(POSTS_ON_PAGE)
+        ])
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def public_urls(self):
+        return {
+            'posts:index': reverse('posts:index'),
+            'posts:group_posts': reverse('posts:group_posts',
+                                         args=[self.group.slug]),
+            'posts:profile': reverse('posts:profile',
+                                     args=[self.user.username]),
+            'posts:post_detail': reverse('posts:post_detail',
+                                         args=[self.post.id]),
+        }
+
+    def test_public_pages_fit_budget(self):
+        """Публичные страницы укладываются в бюджет запросов."""
+        for name, url in self.public_urls().items():
+            for suffix in ('', '?page=2', '?cursor='):
+                with self.subTest(url=url + suffix):
+                    with self.assertQueryBudget(QUERY_BUDGETS[name],
+                                                url + suffix):
+                        self.guest_client.get(url + suffix)
+
+    def test_authorized_pages_fit_budget(self):
+        """Страницы для автора укладываются в бюджет запросов."""
+        urls = dict(
+            self.public_urls(),
+            **{
+                'posts:follow_index': reverse('posts:follow_index'),
+                'posts:post_create': reverse('posts:post_create'),
+                'posts:post_edit': reverse('posts:post_edit',
+                                           args=[self.post.id]),
+            }
+        )
+        for name, url in urls.items():
+            with self.subTest(url=url):
+                with self.assertQueryBudget(
+                        QUERY_BUDGETS[name] + AUTH_QUERIES, url):
+                    self.authorized_client.get(url)
+
+    def test_budget_assertion_fails_over_budget(self):
+        """assertQueryBudget падает при превышении бюджета."""
+        with self.assertRaises(AssertionError):
+            with self.assertQueryBudget(1):
+                list(User.objects.all())
+                list(Group.objects.all())
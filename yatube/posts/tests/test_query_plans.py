@@ -0,0 +1,104 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from ..models import Group, Post, TimelineEntry, User
+from ..paginator import (CURSOR_NEXT, CURSOR_PREVIOUS, POSTS_ON_PAGE,
+                         cursor_queryset, encode_cursor)
+
+SEED_AUTHORS = 5
+SEED_GROUPS = 5
+SEED_POSTS = 500
+
+
+def plan_problems(queryset):
+    """Строки EXPLAIN QUERY PLAN с полным сканом или сортировкой."""
+    plan = queryset.explain()
+    problems = []
+    for line in plan.splitlines():
+        if 'TEMP B-TREE' in line:
+            problems.append(line)
+        elif 'SCAN' in line and 'USING' not in line:
+            problems.append(line)
+    return plan, problems
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN из SQLite')
+class ListingQueryPlanTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.authors = User.objects.bulk_create([
+            User(username=f'plan_author_{i}') for i in range(SEED_AUTHORS)
+        ])
+        cls.author = User.objects.get(username='plan_author_0')
+        Group.objects.bulk_create([
+            Group(title=f'Группа {i}', slug=f'plan-group-{i}',
+                  description='Описание')
+            for i in range(SEED_GROUPS)
+        ])
+        groups = list(Group.objects.all())
+        authors = list(User.objects.filter(username__startswith='plan_'))
+        cls.group = groups[0]
+        Post.objects.bulk_create([
+            Post(text=f'Пост {i}', author=authors[i % SEED_AUTHORS],
+                 group=groups[i % SEED_GROUPS] if i % 3 else None)
+            for i in range(SEED_POSTS)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        middle = Post.objects.all()[SEED_POSTS // 2]
+        TimelineEntry.objects.bulk_create([
+            TimelineEntry(user=cls.author, post=post, author_id=post.author_id,
+                          pub_date=post.pub_date)
+            for post in Post.objects.exclude(author=cls.author)
+        ])
+        cls.cursors = (
+            encode_cursor(middle, CURSOR_NEXT),
+            encode_cursor(middle, CURSOR_PREVIOUS),
+        )
+
+    def listing_querysets(self):
+        return {
+            'index': Post.objects.select_related('author', 'group'),
+            'group_posts': self.group.posts.select_related('author',
+                                                           'group'),
+            'profile': self.author.posts.select_related('group', 'author'),
+        }
+
+    def assertNoScans(self, name, queryset):
+        plan, problems = plan_problems(queryset)
+        self.assertEqual(
+            problems, [],
+            f'{name}: полный скан или сортировка во временном B-tree\n'
+            f'{plan}')
+
+    def test_page_queries_use_indexes(self):
+        """Страница листинга читается по индексу без сортировки."""
+        for name, queryset in self.listing_querysets().items():
+            with self.subTest(view=name):
+                self.assertNoScans(name, queryset[:POSTS_ON_PAGE])
+                self.assertNoScans(
+                    name, queryset[POSTS_ON_PAGE:POSTS_ON_PAGE * 2])
+
+    def test_keyset_queries_use_indexes(self):
+        """Курсорные запросы в обе стороны идут по индексу."""
+        for name, queryset in self.listing_querysets().items():
+            for cursor in self.cursors:
+                with self.subTest(view=name, cursor=cursor):
+                    page_queryset, _ = cursor_queryset(queryset, cursor)
+                    self.assertNoScans(
+                        name, page_queryset[:POSTS_ON_PAGE + 1])
+
+    def test_timeline_queries_use_index(self):
+        """Страница ленты подписок читается по индексу в обе стороны."""
+        entries = TimelineEntry.objects.filter(user=self.author)
+        for cursor in (None,) + self.cursors:
+            with self.subTest(cursor=cursor):
+                page_queryset, _ = cursor_queryset(entries, cursor,
+                                                   id_field='post_id')
+                self.assertNoScans(
+                    'follow_index',
+                    page_queryset.values_list('post_id', 'pub_date')[
+                        :POSTS_ON_PAGE + 1])
@@ -0,0 +1,92 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Post, SearchTerm, User
+from ..search import analyze, search_posts
+from ..stemmer import stem
+
+
+def found_ids(query):
+    return [row['post_id'] for row in search_posts(query)]
+
+
+class StemmerTests(TestCase):
+    def test_word_forms_share_stem(self):
+        """Словоформы сводятся к одной основе."""
+        word_forms = {
+            'книг': ('книга', 'книги', 'книгами', 'книгу'),
+            'красив': ('красивая', 'красивый', 'красивыми'),
+            'дела': ('делаешь', 'делать', 'делал'),
+            'вагон': ('вагоны', 'вагонами', 'вагон'),
+        }
+        for expected, words in word_forms.items():
+            for word in words:
+                with self.subTest(word=word):
+                    self.assertEqual(stem(word), expected)
+
+    def test_analyze_folds_case_and_yo(self):
+        """Регистр и «ё» не влияют на термы, стоп-слова отброшены."""
+        self.assertEqual(analyze('Ёлки и ЕЛКИ'), ['елк', 'елк'])
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='search_author')
+        cls.cats = Post.objects.create(
+            text='Кошки спят. Кошки едят. Кошки играют.', author=cls.author)
+        cls.cat_and_dog = Post.objects.create(
+            text='Кошка подружилась с собакой, а длинный текст про '
+                 'прогулку и погоду разбавляет упоминание кошки.',
+            author=cls.author)
+        cls.dogs = Post.objects.create(
+            text='Собаки гуляют во дворе.', author=cls.author)
+
+    def test_search_matches_word_forms(self):
+        """Поиск находит другие словоформы."""
+        self.assertCountEqual(found_ids('кошками'),
+                              [self.cats.id, self.cat_and_dog.id])
+
+    def test_search_requires_all_terms(self):
+        """Находятся только посты со всеми словами запроса."""
+        self.assertEqual(found_ids('кошка собака'), [self.cat_and_dog.id])
+        self.assertEqual(found_ids('кошка жираф'), [])
+
+    def test_search_ranks_by_term_weight(self):
+        """Пост, где слово встречается чаще, стоит выше."""
+        self.assertEqual(found_ids('кошки'),
+                         [self.cats.id, self.cat_and_dog.id])
+
+    def test_index_follows_edit_and_delete(self):
+        """Индекс обновляется при правке и удалении поста."""
+        post = Post.objects.create(text='Жираф', author=self.author)
+        self.assertEqual(found_ids('жирафы'), [post.id])
+        post = Post.objects.get(pk=post.pk)
+        post.text = 'Бегемот'
+        post.save()
+        self.assertEqual(found_ids('жирафы'), [])
+        self.assertEqual(found_ids('бегемоты'), [post.id])
+        post.delete()
+        self.assertFalse(SearchTerm.objects.filter(post_id=post.id).exists())
+
+    def test_migration_indexes_existing_posts(self):
+        """Миграция индексирует посты, созданные до поиска."""
+        Post.objects.bulk_create([
+            Post(text='Старый пост про жирафа', author=self.author)])
+        self.assertEqual(found_ids('жираф'), [])
+        migration = import_module(
+            'posts.migrations.0013_index_existing_posts')
+        migration.index_existing_posts(apps, None)
+        self.assertEqual(len(found_ids('жираф')), 1)
+        self.assertCountEqual(found_ids('кошки'),
+                              [self.cats.id, self.cat_and_dog.id])
+
+    def test_search_page(self):
+        """Страница поиска показывает найденные посты."""
+        response = Client().get(reverse('posts:search'), {'q': 'собаки'})
+        self.assertEqual(list(response.context['page_obj']),
+                         [self.dogs, self.cat_and_dog])
@@ -1,6 +1,7 @@
 from django import forms
 
 
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
 
@@ -24,6 +25,7 @@ class PostPagesTests(TestCase):
         )
 
     def setUp(self):
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
 
@@ -198,6 +200,7 @@ class PaginatorTests(TestCase):
             for i in range(FIRST_POST, FINAL_POST)])
 
     def setUp(self):
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user_pag)
 
@@ -233,3 +236,68 @@ class PaginatorTests(TestCase):
                                             self.user_pag}) + '?page=2'))
         self.assertEqual(len(response_first.context['page_obj']), 10)
         self.assertEqual(len(response_second.context['page_obj']), 5)
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth_keyset')
+        Post.objects.bulk_create([
+            Post(text=f'Пост {i}', author=cls.user)
+            for i in range(FIRST_POST, FINAL_POST)])
+        cls.ordered_ids = list(
+            Post.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True))
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_cursor_pages_cover_listing_in_order(self):
+        """Курсоры next проходят ленту целиком и по порядку."""
+        response = self.guest_client.get(reverse('posts:index') + '?cursor=')
+        first_page = response.context['page_obj']
+        self.assertFalse(first_page.has_previous())
+        self.assertEqual(len(first_page), POSTS_ON_FIRST_PAGE)
+        response = self.guest_client.get(
+            reverse('posts:index') + f'?cursor={first_page.next_cursor}')
+        second_page = response.context['page_obj']
+        self.assertFalse(second_page.has_next())
+        self.assertEqual(len(second_page), POSTS_ON_FINAL_PAGE)
+        ids = [post.id for post in first_page] + [
+            post.id for post in second_page]
+        self.assertEqual(ids, self.ordered_ids)
+
+    def test_previous_cursor_returns_first_page(self):
+        """Курсор previous возвращает на предыдущую страницу."""
+        first_page = self.guest_client.get(
+            reverse('posts:index') + '?cursor=').context['page_obj']
+        second_page = self.guest_client.get(
+            reverse('posts:index') + f'?cursor={first_page.next_cursor}'
+        ).context['page_obj']
+        back_page = self.guest_client.get(
+            reverse('posts:index') + f'?cursor={second_page.previous_cursor}'
+        ).context['page_obj']
+        self.assertEqual([post.id for post in back_page],
+                         [post.id for post in first_page])
+
+    def test_new_posts_do_not_shift_next_page(self):
+        """Новые посты не сдвигают следующую страницу."""
+        first_page = self.guest_client.get(
+            reverse('posts:profile', args=[self.user.username]) + '?cursor='
+        ).context['page_obj']
+        Post.objects.create(text='Свежий пост', author=self.user)
+        second_page = self.guest_client.get(
+            reverse('posts:profile', args=[self.user.username])
+            + f'?cursor={first_page.next_cursor}'
+        ).context['page_obj']
+        self.assertEqual([post.id for post in second_page],
+                         self.ordered_ids[POSTS_ON_FIRST_PAGE:])
+
+    def test_broken_cursor_returns_first_page(self):
+        """Битый курсор не ломает страницу."""
+        response = self.guest_client.get(
+            reverse('posts:index') + '?cursor=broken')
+        self.assertEqual([post.id for post in response.context['page_obj']],
+                         self.ordered_ids[:POSTS_ON_FIRST_PAGE])
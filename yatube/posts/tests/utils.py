@@ -0,0 +1,24 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """Проверка бюджета SQL-запросов для TestCase."""
+
+    @contextmanager
+    def assertQueryBudget(self, budget, label=''):
+        with CaptureQueriesContext(connection) as captured:
+            yield captured
+        executed = len(captured.captured_queries)
+        if executed > budget:
+            queries = '\n'.join(
+                f'{number}. {query["sql"]}'
+                for number, query in enumerate(
+                    captured.captured_queries, start=1)
+            )
+            self.fail(
+                f'{label or "Блок"} выполнил {executed} SQL-запросов '
+                f'при бюджете {budget}:\n{queries}'
+            )
@@ -0,0 +1,108 @@
+from collections import namedtuple
+
+from django.db import transaction
+
+from .models import Follow, Post, TimelineEntry
+from .paginator import (CURSOR_PREVIOUS, POSTS_ON_PAGE, cursor_queryset,
+                        keyset_page)
+
+# Авторам с большим числом подписчиков посты не рассылаются по лентам:
+# подписчики читают их из Post при открытии ленты.
+FANOUT_MAX_FOLLOWERS = 1000
+FANOUT_BATCH_SIZE = 1000
+FOLLOW_BACKFILL = 100
+
+TimelineKey = namedtuple('TimelineKey', 'pk pub_date')
+
+
+def is_fanned_out_on_read(author_id):
+    return Follow.objects.filter(
+        author_id=author_id, fan_out_on_read=True).exists()
+
+
+def fan_out(post):
+    """Разложить новый пост по лентам подписчиков автора."""
+    if is_fanned_out_on_read(post.author_id):
+        return
+    follower_ids = Follow.objects.filter(
+        author_id=post.author_id).values_list('user_id', flat=True)
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=user_id, post_id=post.pk,
+                          author_id=post.author_id, pub_date=post.pub_date)
+            for user_id in follower_ids
+        ],
+        batch_size=FANOUT_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+@transaction.atomic
+def follow(user, author):
+    """Подписать user на author и добавить в ленту его последние посты."""
+    on_read = is_fanned_out_on_read(author.pk)
+    _, created = Follow.objects.get_or_create(
+        user=user, author=author, defaults={'fan_out_on_read': on_read})
+    if not created or on_read:
+        return
+    followers = Follow.objects.filter(author=author)
+    if followers[:FANOUT_MAX_FOLLOWERS + 1].count() > FANOUT_MAX_FOLLOWERS:
+        # Уже разложенные посты остаются в лентах, при чтении
+        # повторы отбрасываются.
+        followers.update(fan_out_on_read=True)
+        return
+    recent = author.posts.order_by('-pub_date', '-id').values_list(
+        'id', 'pub_date')[:FOLLOW_BACKFILL]
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user=user, post_id=post_id, author=author,
+                          pub_date=pub_date)
+            for post_id, pub_date in recent
+        ],
+        ignore_conflicts=True,
+    )
+
+
+@transaction.atomic
+def unfollow(user, author):
+    Follow.objects.filter(user=user, author=author).delete()
+    TimelineEntry.objects.filter(user=user, author=author).delete()
+
+
+def timeline_page(user, cursor=None, posts_on_page=POSTS_ON_PAGE):
+    """Страница ленты подписок user.
+
+    Разложенные посты читаются из TimelineEntry по индексу
+    (user, pub_date, post), посты авторов с рассылкой при чтении -
+    из Post по индексу (author, pub_date, id). Обе выборки ограничены
+    размером страницы и сливаются в памяти, так что время не зависит
+    ни от длины ленты, ни от числа подписок.
+    """
+    on_read_author_ids = list(Follow.objects.filter(
+        user=user, fan_out_on_read=True).values_list('author_id', flat=True))
+
+    def fetch(cursor, limit):
+        entries, direction = cursor_queryset(
+            TimelineEntry.objects.filter(user=user), cursor,
+            id_field='post_id')
+        keys = [
+            TimelineKey(*row)
+            for row in entries.values_list('post_id', 'pub_date')[:limit]
+        ]
+        if on_read_author_ids:
+            posts, _ = cursor_queryset(
+                Post.objects.filter(author_id__in=on_read_author_ids), cursor)
+            keys = sorted(
+                set(keys).union(
+                    TimelineKey(*row)
+                    for row in posts.values_list('id', 'pub_date')[:limit]),
+                key=lambda key: (key.pub_date, key.pk),
+                reverse=direction != CURSOR_PREVIOUS,
+            )[:limit]
+        return keys, direction
+
+    page = keyset_page(fetch, cursor, posts_on_page)
+    posts = Post.objects.select_related('author', 'group').in_bulk(
+        [key.pk for key in page])
+    page.object_list = [posts[key.pk] for key in page if key.pk in posts]
+    return page
@@ -1,26 +1,48 @@
+from urllib.parse import urlencode
+
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.http import (HttpResponseBadRequest, JsonResponse,
+                         StreamingHttpResponse)
+from django.views.decorators.http import condition, require_safe
 
-from .models import Post, Group, User
+from .cache import (INDEX_SCOPE, cache_page_for_anonymous, group_scope,
+                    invalidate_scopes, post_etag, profile_scope,
+                    versioned_listing)
+from .counters import INDEX_COUNT_KEY, CachedCount, group_count_key
+from .export import FORMATS, export_posts
+from .models import Follow, Post, Group, User
 from .paginator import paginate
-from posts.forms import PostForm
+from .search import search_posts
+from .timeline import follow, timeline_page, unfollow
+from posts.forms import PostForm, search_groups
 
 
+@versioned_listing(lambda: INDEX_SCOPE)
+@cache_page_for_anonymous(lambda: INDEX_SCOPE)
 def index(request):
-    post_list = Post.objects.all()
+    post_list = Post.objects.select_related('author', 'group')
     page_number = request.GET.get('page')
-    page_obj = paginate(post_list, page_number)
+    page_obj = paginate(post_list, page_number,
+                        cursor=request.GET.get('cursor'),
+                        count=CachedCount(INDEX_COUNT_KEY, post_list))
     context = {
         'page_obj': page_obj,
     }
     return render(request, 'posts/index.html', context)
 
 
+@versioned_listing(group_scope)
+@cache_page_for_anonymous(group_scope)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
+    post_list = group.posts.select_related('author', 'group')
     page_number = request.GET.get('page')
-    page_obj = paginate(post_list, page_number)
+    page_obj = paginate(post_list, page_number,
+                        cursor=request.GET.get('cursor'),
+                        count=CachedCount(group_count_key(group.pk),
+                                          post_list))
     context = {
         'group': group,
         'page_obj': page_obj,
@@ -28,27 +50,123 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@versioned_listing(profile_scope)
+@cache_page_for_anonymous(profile_scope)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
+    author = get_object_or_404(
+        User.objects.select_related('post_counter'), username=username)
     posts = author.posts.select_related('group', 'author')
+    counter = getattr(author, 'post_counter', None)
     page_number = request.GET.get('page')
-    page_obj = paginate(posts, page_number)
-
+    page_obj = paginate(posts, page_number,
+                        cursor=request.GET.get('cursor'),
+                        count=counter and counter.posts_count)
+    following = (
+        request.user.is_authenticated and request.user != author
+        and Follow.objects.filter(user=request.user, author=author).exists()
+    )
     context = {
         'author': author,
         'page_obj': page_obj,
+        'following': following,
     }
     return render(request, 'posts/profile.html', context)
 
 
+@condition(etag_func=post_etag)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author__post_counter', 'group'),
+        pk=post_id)
     context = {
         'post': post,
     }
     return render(request, 'posts/post_detail.html', context)
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    page_number = request.GET.get('page')
+    page_obj = paginate(search_posts(query), page_number)
+    posts = Post.objects.select_related('author', 'group').in_bulk(
+        [row['post_id'] for row in page_obj])
+    page_obj.object_list = [
+        posts[row['post_id']] for row in page_obj if row['post_id'] in posts
+    ]
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'pagination_query': urlencode({'q': query}) + '&',
+    }
+    return render(request, 'posts/search.html', context)
+
+
+@login_required
+@require_safe
+def group_autocomplete(request):
+    """Группы для поля поиска в форме поста, без запроса к базе."""
+    results = [
+        {'id': pk, 'text': title}
+        for pk, title in search_groups(request.GET.get('q', ''))
+    ]
+    return JsonResponse({'results': results})
+
+
+@login_required
+def follow_index(request):
+    page_obj = timeline_page(request.user, request.GET.get('cursor'))
+    context = {
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/follow.html', context)
+
+
+@login_required
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    if author != request.user:
+        follow(request.user, author)
+        # Кнопка подписки входит в ETag страницы профиля.
+        invalidate_scopes(profile_scope(username))
+    return redirect('posts:profile', username)
+
+
+@login_required
+def profile_unfollow(request, username):
+    author = get_object_or_404(User, username=username)
+    unfollow(request.user, author)
+    invalidate_scopes(profile_scope(username))
+    return redirect('posts:profile', username)
+
+
+def export_response(request, post_list, filename):
+    file_format = request.GET.get('format', 'ndjson')
+    if file_format not in FORMATS:
+        return HttpResponseBadRequest(
+            f'Формат должен быть одним из: {", ".join(FORMATS)}')
+    response = StreamingHttpResponse(
+        export_posts(post_list, file_format),
+        content_type=FORMATS[file_format])
+    response['Content-Disposition'] = (
+        f'attachment; filename="{filename}.{file_format}"')
+    return response
+
+
+@staff_member_required
+def group_export(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return export_response(
+        request, Post.objects.filter(group_id=group.pk), f'group-{slug}')
+
+
+@staff_member_required
+def profile_export(request, username):
+    author = get_object_or_404(User, username=username)
+    return export_response(
+        request, Post.objects.filter(author_id=author.pk),
+        f'profile-{username}')
+
+
 @login_required
 def post_create(request):
     form = PostForm(request.POST or None)
@@ -71,7 +189,7 @@ def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = PostForm(request.POST or None, instance=post)
     is_edit = True
-    if request.user != post.author:
+    if request.user.id != post.author_id:
         return redirect('posts:post_detail', post_id)
     if form.is_valid():
         form.save()
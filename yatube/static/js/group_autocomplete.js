@@ -0,0 +1,25 @@
+// Поиск группы в форме поста: подгружает варианты в соседний select.
+document.querySelectorAll('[data-group-autocomplete]').forEach((input) => {
+  const select = document.getElementById(input.getAttribute('aria-controls'));
+  const emptyOption = select.querySelector('option[value=""]');
+  let timer = null;
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(async () => {
+      const url = new URL(input.dataset.groupAutocomplete, location.href);
+      url.searchParams.set('q', input.value);
+      const response = await fetch(url, {credentials: 'same-origin'});
+      if (!response.ok) {
+        return;
+      }
+      const {results} = await response.json();
+      select.replaceChildren(
+        ...(emptyOption ? [emptyOption] : []),
+        ...results.map(({id, text}) => new Option(text, id)),
+      );
+      if (results.length) {
+        select.value = results[0].id;
+      }
+    }, 250);
+  });
+});
@@ -45,6 +45,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.PrecompressedStaticMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.SlowQueryMiddleware',
+    'core.middleware.ReplicaStickyMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -55,12 +59,27 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'yatube.urls'
 
+# Кэширующий загрузчик компилирует шаблон один раз на процесс;
+# по умолчанию он выключен в DEBUG, чтобы правки шаблонов были видны.
+CACHED_TEMPLATES = os.environ.get(
+    'YATUBE_CACHED_TEMPLATES', '0' if DEBUG else '1') == '1'
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if CACHED_TEMPLATES:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backend.InstrumentedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
+        'APP_DIRS': False,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -75,6 +94,20 @@ TEMPLATES = [
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
 
+# Метрики запросов (core.middleware.MetricsMiddleware). Без
+# YATUBE_METRICS_DIR /metrics показывает только свой процесс; с ним
+# воркеры складывают снимки гистограмм в этот каталог (свой для
+# каждого сайта), и /metrics их суммирует.
+METRICS_DIR = os.environ.get('YATUBE_METRICS_DIR')
+METRICS_FLUSH_SECONDS = 5
+METRICS_TOKEN = os.environ.get('YATUBE_METRICS_TOKEN', '')
+
+# Журнал медленных SQL-запросов в JSON lines, по умолчанию выключен.
+SLOW_QUERY_LOG = os.environ.get('YATUBE_SLOW_QUERY_LOG')
+SLOW_QUERY_THRESHOLD_MS = float(
+    os.environ.get('YATUBE_SLOW_QUERY_THRESHOLD_MS', 100))
+
+
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
 
@@ -82,9 +115,85 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # 0 - новое соединение на каждый запрос, None - без ограничения.
+        'CONN_MAX_AGE': int(os.environ.get('YATUBE_CONN_MAX_AGE', 0)),
     }
 }
 
+# Выполняются для каждого нового SQLite-соединения (core.sqlite).
+# WAL позволяет читать во время записи, busy_timeout - ждать
+# блокировку вместо ошибки «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory',
+}
+
+# Реплики только для чтения: пути к копиям базы через запятую.
+# Локально их обновляет команда sync_replica; другой механизм
+# обновления должен так же вызывать core.db_router.bump_replica_generation.
+REPLICA_DATABASES = []
+for number, path in enumerate(
+        filter(None, os.environ.get('YATUBE_DB_REPLICAS', '').split(',')),
+        start=1):
+    DATABASES[f'replica_{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'CONN_MAX_AGE': DATABASES['default']['CONN_MAX_AGE'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Сколько секунд после записи читать с основной базы.
+REPLICA_STICKY_SECONDS = int(
+    os.environ.get('YATUBE_REPLICA_STICKY_SECONDS', 10))
+REPLICA_STICKY_COOKIE = 'use_primary'
+
+# Версии областей кэша, кэш страниц и счётчики постов должны быть
+# общими для всех процессов: в продакшене - memcached или redis,
+# на одной машине подойдёт FileBasedCache с каталогом в
+# YATUBE_CACHE_LOCATION. С кэшем в памяти процесса (по умолчанию) кэш
+# страниц, ETag листингов и закэшированные счётчики выключены:
+# запись в одном воркере не сбросила бы их в остальных.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'YATUBE_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('YATUBE_CACHE_LOCATION', ''),
+    }
+}
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+# YATUBE_SHARED_CACHE=1 включает кэш страниц и с кэшем в памяти, если
+# процесс один (runserver, один воркер).
+SHARED_CACHE = os.environ.get(
+    'YATUBE_SHARED_CACHE',
+    '0' if CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES else '1',
+) == '1'
+
+# Хранилище сессий. db читает django_session на каждом запросе;
+# cached_db читает из кэша; signed_cookies хранит сессию в cookie;
+# write_behind (core.sessions) ещё и пишет изменения в базу не чаще
+# раза в SESSION_WRITE_BEHIND_SECONDS. Режимы с кэшем требуют общего
+# для процессов кэша (memcached, redis), поэтому по умолчанию - db.
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'write_behind': 'core.sessions',
+}
+SESSION_MODE = os.environ.get('YATUBE_SESSION_MODE', 'db')
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+SESSION_WRITE_BEHIND_SECONDS = 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -125,6 +234,12 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
+STATIC_ROOT = os.environ.get('YATUBE_STATIC_ROOT',
+                             os.path.join(BASE_DIR, 'static_collected'))
+# Без DEBUG статика собирается collectstatic с хэшами в именах и
+# сжатыми копиями, раздаёт её core.middleware.PrecompressedStaticMiddleware.
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -135,4 +250,7 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 NUM_OF_POSTS = 10
 
+# Поиск группы вместо выпадающего списка в форме поста, для тысяч групп.
+GROUP_AUTOCOMPLETE = os.environ.get('YATUBE_GROUP_AUTOCOMPLETE') == '1'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
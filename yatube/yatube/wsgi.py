@@ -8,9 +8,19 @@ https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 """
 
 import os
+import time
 
 from django.core.wsgi import get_wsgi_application
 
+started = time.monotonic()
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
 application = get_wsgi_application()
+
+# Прогрев до первого запроса; YATUBE_WARMUP=0 отключает его. Соединения
+# с базой прогрев закрывает, воркеры открывают их после fork
+# (gunicorn.conf.py).
+if os.environ.get('YATUBE_WARMUP', '1') == '1':
+    from core.warmup import warm_up
+    warm_up(started)